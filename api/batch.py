@@ -0,0 +1,150 @@
+"""
+Batch backtests streamed as newline-delimited JSON.
+
+Tickers are processed in chunks of BATCH_CHUNK_SIZE. Each chunk's prices come
+from one fetch_price_panel call and its stored results from one query; the
+tickers that still need computing are backtested in parallel on
+compute_executor and every (ticker, strategy) result is yielded as soon as
+its ticker finishes. A chunk's new rows are saved with one bulk insert. The
+next chunk is fetched while the current one computes, so the time to the
+first result depends on the chunk size, not on the number of tickers.
+"""
+import asyncio
+import json
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from api.config import BATCH_CHUNK_SIZE
+from api.executor import io_executor, compute_executor
+from api.pipeline import cached_results, compute_results, result_dict, strategy_keys
+from db.models import BacktestResult
+from db.session import SessionLocal
+from quant.data import fetch_price_panel
+
+
+def _load_chunk(tickers, start, end, strategies):
+    """
+    Fetch a chunk's prices and stored results -> (loaded, found). loaded maps
+    each ticker to (df, {strategy: cache key}) or to an error message, found
+    maps the cache keys already stored to their result dicts.
+    """
+    panel = fetch_price_panel(tickers, start, end)
+
+    loaded = {}
+    for ticker in tickers:
+        df = panel.frame(ticker)
+        if df.empty:
+            loaded[ticker] = f"No price data for {ticker}"
+            continue
+        keys = strategy_keys(ticker, start, end, df)
+        loaded[ticker] = (df, {name: keys[name] for name in strategies})
+
+    all_keys = [key for item in loaded.values() if not isinstance(item, str) for key in item[1].values()]
+    db = SessionLocal()
+    try:
+        found = {key: result_dict(row) for key, row in cached_results(db, all_keys).items()}
+    finally:
+        db.close()
+    return loaded, found
+
+
+def _save_chunk(rows):
+    """Insert a chunk's new backtest_results rows in one executemany"""
+    db = SessionLocal()
+    try:
+        db.execute(insert(BacktestResult), rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _line(record):
+    return json.dumps(record, default=str) + "\n"
+
+
+async def stream_batch(tickers, strategies, start, end, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Backtest strategies on every ticker between start and end, yielding one
+    NDJSON line per (ticker, strategy) result or per failed ticker, and a
+    final summary line.
+    """
+    chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+    counts = {'results': 0, 'cached': 0, 'errors': 0}
+
+    def load(chunk):
+        return asyncio.ensure_future(io_executor.run_when_free(_load_chunk, chunk, start, end, strategies))
+
+    next_load = load(chunks[0]) if chunks else None
+    pending = {}
+    try:
+        for i, chunk in enumerate(chunks):
+            try:
+                loaded, found = await next_load
+            except Exception as e:
+                loaded, found = {ticker: str(e) for ticker in chunk}, {}
+            # Fetch the next chunk while this one computes
+            next_load = load(chunks[i + 1]) if i + 1 < len(chunks) else None
+
+            for ticker, item in loaded.items():
+                if isinstance(item, str):
+                    counts['errors'] += 1
+                    yield _line({'ticker': ticker, 'error': item})
+                    continue
+
+                df, keys = item
+                if all(key in found for key in keys.values()):
+                    for key in keys.values():
+                        counts['results'] += 1
+                        counts['cached'] += 1
+                        yield _line({'ticker': ticker, **found[key], 'cached': True})
+                    continue
+
+                task = asyncio.ensure_future(compute_executor.run_when_free(compute_results, ticker, start, end, df))
+                pending[task] = (ticker, keys)
+
+            rows = []
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    ticker, keys = pending.pop(task)
+                    try:
+                        computed = task.result()
+                    except Exception as e:
+                        counts['errors'] += 1
+                        yield _line({'ticker': ticker, 'error': str(e)})
+                        continue
+
+                    for strategy_name, key in keys.items():
+                        counts['results'] += 1
+                        if key in found:
+                            counts['cached'] += 1
+                            yield _line({'ticker': ticker, **found[key], 'cached': True})
+                            continue
+                        rows.append({
+                            'ticker': ticker,
+                            'start_date': start,
+                            'end_date': end,
+                            'strategy_name': strategy_name,
+                            'cache_key': key,
+                            'created_at': datetime.now(),
+                            **computed[strategy_name]
+                        })
+                        yield _line({'ticker': ticker, 'strategy_name': strategy_name,
+                                     **computed[strategy_name], 'cached': False})
+
+            if rows:
+                try:
+                    await io_executor.run_when_free(_save_chunk, rows)
+                except Exception as e:
+                    yield _line({'tickers': chunk, 'error': f"Saving results failed: {e}"})
+
+        yield _line({'done': True, 'tickers': len(tickers), **counts})
+    finally:
+        # The client went away (or the loop failed): drop work nobody will read
+        for task in [next_load, *pending]:
+            if task is not None:
+                task.cancel()
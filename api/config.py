@@ -0,0 +1,25 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Background job workers (threads) per API process and how often idle workers poll for queued jobs
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+
+# Running jobs whose state has not changed for this many seconds are considered
+# abandoned by a crashed process and requeued at startup
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "600"))
+# Running jobs are touched this often, so a long ticker never looks abandoned
+JOB_HEARTBEAT_SECONDS = int(os.getenv("JOB_HEARTBEAT_SECONDS", "30"))
+
+# Request executors: threads for blocking I/O (downloads, database), processes for backtest compute.
+# *_QUEUE caps running plus waiting tasks; beyond it requests get 429 with Retry-After.
+API_IO_WORKERS = int(os.getenv("API_IO_WORKERS", "8"))
+API_IO_QUEUE = int(os.getenv("API_IO_QUEUE", "64"))
+API_COMPUTE_WORKERS = int(os.getenv("API_COMPUTE_WORKERS", "0"))  # 0 uses the CPU count
+API_COMPUTE_QUEUE = int(os.getenv("API_COMPUTE_QUEUE", "16"))
+API_RETRY_AFTER = int(os.getenv("API_RETRY_AFTER", "5"))
+
+# Tickers fetched and saved together by the batch endpoint; the first results stream once the first chunk is computed
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "8"))
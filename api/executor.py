@@ -0,0 +1,109 @@
+"""
+Bounded executors that keep blocking work off the event loop.
+
+io_executor runs downloads and database calls on threads; compute_executor
+runs backtests in worker processes so they neither block the loop nor hold
+the GIL. Each accepts at most its *_QUEUE tasks (running plus waiting);
+past that, run() raises ExecutorSaturated right away so the endpoint can
+answer 429 instead of piling up requests.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from api.config import (
+    API_IO_WORKERS, API_IO_QUEUE, API_COMPUTE_WORKERS, API_COMPUTE_QUEUE, API_RETRY_AFTER
+)
+
+
+class ExecutorSaturated(Exception):
+    """Raised when a bounded executor already has its maximum of pending tasks"""
+
+    def __init__(self, name, retry_after=API_RETRY_AFTER):
+        super().__init__(f"The {name} executor is at capacity, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class BoundedExecutor:
+    """An executor created on first use, admitting at most max_pending tasks at once"""
+
+    def __init__(self, name, factory, max_pending):
+        self.name = name
+        self.max_pending = max_pending
+        self._factory = factory
+        self._executor = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.rejected = 0
+
+    def _get(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._factory()
+            return self._executor
+
+    @property
+    def full(self):
+        return self.pending >= self.max_pending
+
+    def _acquire(self, count_rejection=True):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += count_rejection
+                return False
+            self.pending += 1
+            return True
+
+    def _release(self, _future=None):
+        with self._lock:
+            self.pending -= 1
+
+    def _submit(self, fn, *args):
+        """Submit into a slot already acquired"""
+        try:
+            future = self._get().submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        # Free the slot when the work ends, even if the awaiting request was cancelled
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn, *args):
+        if not self._acquire():
+            raise ExecutorSaturated(self.name)
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    async def run_when_free(self, fn, *args, poll=0.2):
+        """run(), waiting for a free slot instead of raising; for work already accepted"""
+        while not self._acquire(count_rejection=False):
+            await asyncio.sleep(poll)
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def submit_when_free(self, fn, *args, poll=0.2):
+        """Blocking submit for worker threads outside the event loop -> concurrent.futures.Future"""
+        while not self._acquire(count_rejection=False):
+            time.sleep(poll)
+        return self._submit(fn, *args)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+
+io_executor = BoundedExecutor(
+    "io", lambda: ThreadPoolExecutor(max_workers=API_IO_WORKERS, thread_name_prefix="api-io"), API_IO_QUEUE
+)
+
+# spawn: forking a server process with live threads can deadlock the children
+compute_executor = BoundedExecutor(
+    "compute",
+    lambda: ProcessPoolExecutor(max_workers=API_COMPUTE_WORKERS or os.cpu_count() or 1,
+                                mp_context=multiprocessing.get_context("spawn")),
+    API_COMPUTE_QUEUE
+)
@@ -0,0 +1,228 @@
+"""
+Background jobs for long-running backtests.
+
+Jobs are rows in the backtest_jobs table, so queued work survives restarts
+and is visible to every API process. Worker threads claim the oldest queued
+job with a conditional UPDATE (only one claimer can move it from queued to
+running), run its handler and store progress, result or error on the row.
+A maintenance thread keeps updated_at of running jobs fresh and requeues
+running jobs that went stale, so only jobs of a process that died (or of a
+worker that lost the database mid-job) are picked up again.
+Submitting a job wakes the local workers; otherwise they poll every
+JOB_POLL_INTERVAL seconds. The table is created by db/init_db.py.
+"""
+import json
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+
+from api.config import JOB_WORKERS, JOB_POLL_INTERVAL, JOB_STALE_SECONDS, JOB_HEARTBEAT_SECONDS
+from api.pipeline import run_all_backtests_pooled
+from db.models import BacktestJob
+from db.session import SessionLocal
+
+FINISHED = ("done", "failed")
+
+
+def job_dict(job):
+    return {
+        'job_id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'progress': job.progress,
+        'payload': json.loads(job.payload),
+        'result': json.loads(job.result) if job.result else None,
+        'error': job.error,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+    }
+
+
+def run_all_backtests_job(payload, report):
+    """
+    Run every strategy for payload['tickers'] between start_date and
+    end_date, one ticker at a time, with the backtests on the API's compute
+    processes
+    """
+    start = datetime.strptime(payload['start_date'], '%Y-%m-%d').date()
+    end = datetime.strptime(payload['end_date'], '%Y-%m-%d').date()
+    tickers = payload['tickers']
+
+    results = {}
+    for i, ticker in enumerate(tickers):
+        try:
+            ticker_results, cached = run_all_backtests_pooled(ticker, start, end)
+            results[ticker] = {'results': ticker_results, 'cached': cached}
+        except Exception as e:
+            # One bad ticker is reported in the result instead of failing the whole job
+            results[ticker] = {'error': str(e)}
+        report((i + 1) / len(tickers))
+
+    return results
+
+
+# Job kind -> handler(payload, report); report(progress) records a fraction in [0, 1]
+JOB_HANDLERS = {
+    'run_all_backtests': run_all_backtests_job,
+}
+
+
+class JobQueue:
+    """Database-backed job queue with a pool of worker threads"""
+
+    def __init__(self, session_factory=SessionLocal, workers=JOB_WORKERS, poll_interval=JOB_POLL_INTERVAL):
+        self.session_factory = session_factory
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._running = set()
+        self._running_lock = threading.Lock()
+
+    def start(self):
+        """
+        Start the workers. Nothing here touches the database, so the app
+        boots while it is unreachable; the workers claim jobs and the
+        maintenance thread requeues abandoned ones once it answers.
+        """
+        self._stopping.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"backtest-job-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        thread = threading.Thread(target=self._maintain, name="backtest-job-maintenance", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self, timeout=5):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def requeue_stale(self):
+        """Put running jobs that stopped updating (their process died) back in the queue"""
+        cutoff = datetime.utcnow() - timedelta(seconds=JOB_STALE_SECONDS)
+        self._update_where(
+            (BacktestJob.status == "running") & (BacktestJob.updated_at < cutoff),
+            status="queued", progress=0.0
+        )
+
+    def submit(self, kind, payload):
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        db = self.session_factory()
+        try:
+            job = BacktestJob(id=str(uuid.uuid4()), kind=kind, status="queued", payload=json.dumps(payload),
+                              progress=0.0, created_at=datetime.utcnow(), updated_at=datetime.utcnow())
+            db.add(job)
+            db.commit()
+            result = job_dict(job)
+        finally:
+            db.close()
+
+        self._wakeup.set()
+        return result
+
+    def get(self, job_id):
+        db = self.session_factory()
+        try:
+            job = db.get(BacktestJob, job_id)
+            return job_dict(job) if job is not None else None
+        finally:
+            db.close()
+
+    def _update_where(self, condition, **values):
+        db = self.session_factory()
+        try:
+            count = db.execute(
+                update(BacktestJob).where(condition).values(updated_at=datetime.utcnow(), **values)
+            ).rowcount
+            db.commit()
+            return count
+        finally:
+            db.close()
+
+    def _claim(self):
+        """Move the oldest queued job to running; None if there is nothing to claim"""
+        db = self.session_factory()
+        try:
+            candidates = db.scalars(
+                select(BacktestJob.id).where(BacktestJob.status == "queued")
+                .order_by(BacktestJob.created_at).limit(5)
+            ).all()
+        finally:
+            db.close()
+
+        for job_id in candidates:
+            claimed = self._update_where(
+                (BacktestJob.id == job_id) & (BacktestJob.status == "queued"),
+                status="running", started_at=datetime.utcnow()
+            )
+            if claimed:
+                return job_id
+        return None
+
+    def _run(self, job_id):
+        with self._running_lock:
+            self._running.add(job_id)
+        try:
+            self._run_claimed(job_id)
+        finally:
+            with self._running_lock:
+                self._running.discard(job_id)
+
+    def _run_claimed(self, job_id):
+        def report(progress):
+            self._update_where(BacktestJob.id == job_id, progress=progress)
+
+        try:
+            job = self.get(job_id)
+            result = JOB_HANDLERS[job['kind']](job['payload'], report)
+            self._update_where(BacktestJob.id == job_id, status="done", progress=1.0,
+                               result=json.dumps(result, default=str), finished_at=datetime.utcnow())
+        except Exception as e:
+            self._update_where(BacktestJob.id == job_id, status="failed", error=str(e),
+                               finished_at=datetime.utcnow())
+
+    def _work(self):
+        while not self._stopping.is_set():
+            try:
+                job_id = self._claim()
+                if job_id is not None:
+                    self._run(job_id)
+                    continue
+            except Exception:
+                # Database unavailable (even for recording the failure); a job left running
+                # is requeued once stale, and this worker polls again
+                pass
+
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def _maintain(self):
+        """
+        Every JOB_HEARTBEAT_SECONDS, touch the jobs this process is running
+        (so requeue_stale leaves them alone) and requeue stale ones
+        """
+        while not self._stopping.is_set():
+            with self._running_lock:
+                running = list(self._running)
+            try:
+                if running:
+                    self._update_where(BacktestJob.id.in_(running) & (BacktestJob.status == "running"))
+                self.requeue_stale()
+            except Exception:
+                # Database unavailable; the next round tries again
+                pass
+            self._stopping.wait(JOB_HEARTBEAT_SECONDS)
+
+
+job_queue = JobQueue()
@@ -0,0 +1,185 @@
+"""
+Backtest pipeline behind the API endpoints: fetch prices, reuse stored
+results when the same inputs were already run, otherwise backtest and save.
+
+Stored backtest_results rows carry a cache_key (quant.fingerprint.result_key)
+over the ticker, dates, strategy, parameters and price data fingerprint, so
+a repeated request is answered from the table and revised price data misses
+the old rows.
+"""
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from api.executor import io_executor, compute_executor
+from db.models import BacktestResult
+from db.session import SessionLocal
+from quant.backtest import run_all_backtests
+from quant.data import fetch_price_data
+from quant.fingerprint import data_fingerprint, default_params, result_key
+from quant.signals import STRATEGIES
+
+
+def result_dict(row):
+    """API representation of a stored run-all-backtests result"""
+    return {
+        'strategy_name': row.strategy_name,
+        'sharpe_ratio': row.sharpe_ratio,
+        'final_equity': row.final_equity,
+        'max_drawdown': row.max_drawdown,
+        'total_return': row.total_return,
+        'win_rate': row.win_rate,
+        'num_trades': row.num_trades,
+    }
+
+
+def cached_results(db: Session, keys):
+    """Newest stored row for each cache key that has one -> {key: BacktestResult}"""
+    rows = (
+        db.query(BacktestResult)
+        .filter(BacktestResult.cache_key.in_(list(keys)))
+        .order_by(BacktestResult.created_at.desc(), BacktestResult.id.desc())
+        .all()
+    )
+    found = {}
+    for row in rows:
+        found.setdefault(row.cache_key, row)
+    return found
+
+
+def strategy_keys(ticker, start, end, df):
+    """{strategy_name: cache key} for every registered strategy on this data"""
+    fingerprint = data_fingerprint(df)
+    return {
+        name: result_key(ticker, start, end, name, default_params(fn), fingerprint)
+        for name, fn in STRATEGIES.items()
+    }
+
+
+def load_cached(db: Session, ticker, start, end):
+    """Fetch the prices and look up stored results -> (df, {strategy: key}, {key: row})"""
+    df = fetch_price_data(ticker, start, end)
+    keys = strategy_keys(ticker, start, end, df)
+    return df, keys, cached_results(db, keys.values())
+
+
+def compute_results(ticker, start, end, df):
+    """
+    Backtest every strategy on df -> {strategy_name: stored metric values}.
+    Pure computation on picklable inputs, so it can run in a worker process.
+    """
+    computed = {}
+    for strategy_name, model in run_all_backtests(ticker, start, end, df=df).items():
+        computed[strategy_name] = {
+            'sharpe_ratio': float(round(model['sharpe'], 3)),
+            'final_equity': float(round(model['final_equity'], 4)),
+            'max_drawdown': float(round(model['max_drawdown'], 4) * 100),  # Store as percentage
+            'total_return': float(round(model['total_return'], 2)),
+            'win_rate': float(round(model['win_rate'], 2)),
+            'num_trades': int(model['num_trades']),
+        }
+    return computed
+
+
+def save_results(db: Session, ticker, start, end, keys, found, computed):
+    """Add rows for the computed strategies (the caller commits) -> results in strategy order"""
+    results_list = []
+    for strategy_name, key in keys.items():
+        if key in found:
+            results_list.append(result_dict(found[key]))
+            continue
+
+        result = BacktestResult(
+            ticker=ticker,
+            start_date=start,
+            end_date=end,
+            strategy_name=strategy_name,
+            cache_key=key,
+            created_at=datetime.now(),
+            **computed[strategy_name]
+        )
+        db.add(result)
+        results_list.append(result_dict(result))
+
+    return results_list
+
+
+def run_all_backtests_cached(db: Session, ticker, start, end):
+    """
+    Results of every strategy for ticker between start and end, as
+    (results, cached). Strategies already stored for identical inputs and
+    price data are read back; the others are backtested and saved (the
+    caller commits). cached is True when nothing had to be computed.
+    """
+    df, keys, found = load_cached(db, ticker, start, end)
+    if len(found) == len(keys):
+        return [result_dict(found[keys[name]]) for name in keys], True
+
+    computed = compute_results(ticker, start, end, df)
+    return save_results(db, ticker, start, end, keys, found, computed), False
+
+
+def _load_cached(ticker, start, end):
+    db = SessionLocal()
+    try:
+        df, keys, found = load_cached(db, ticker, start, end)
+        # Plain dicts, since the rows are detached once the session closes
+        return df, keys, {key: result_dict(row) for key, row in found.items()}
+    finally:
+        db.close()
+
+
+def _save_results(ticker, start, end, keys, computed):
+    db = SessionLocal()
+    try:
+        results_list = save_results(db, ticker, start, end, keys, {}, computed)
+        db.commit()
+        return results_list
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def run_all_backtests_async(ticker, start, end):
+    """
+    run_all_backtests_cached for async endpoints: fetching and database work
+    run on io_executor and the backtests on compute_executor, so the event
+    loop stays free. Raises ExecutorSaturated when either is at capacity
+    before the backtests start; saving their results waits for a slot.
+    """
+    df, keys, found = await io_executor.run(_load_cached, ticker, start, end)
+    if len(found) == len(keys):
+        return [found[keys[name]] for name in keys], True
+
+    computed = await compute_executor.run(compute_results, ticker, start, end, df)
+    computed = {name: values for name, values in computed.items() if keys[name] not in found}
+
+    # The backtests are done; wait for an I/O slot rather than throw them away with a 429
+    saved = await io_executor.run_when_free(_save_results, ticker, start, end,
+                                            {name: keys[name] for name in computed}, computed)
+    return _merge(keys, found, saved), False
+
+
+def run_all_backtests_pooled(ticker, start, end):
+    """
+    run_all_backtests_cached for worker threads (background jobs): the
+    backtests run on compute_executor's processes, waiting for a free slot,
+    so a long job does not hold the GIL the event loop needs.
+    """
+    df, keys, found = _load_cached(ticker, start, end)
+    if len(found) == len(keys):
+        return [found[keys[name]] for name in keys], True
+
+    computed = compute_executor.submit_when_free(compute_results, ticker, start, end, df).result()
+    computed = {name: values for name, values in computed.items() if keys[name] not in found}
+
+    saved = _save_results(ticker, start, end, {name: keys[name] for name in computed}, computed)
+    return _merge(keys, found, saved), False
+
+
+def _merge(keys, found, saved):
+    """Stored and newly saved results back in strategy order"""
+    saved = iter(saved)
+    return [found[key] if key in found else next(saved) for key in keys.values()]
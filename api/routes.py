@@ -1,14 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import HTMLResponse, FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import datetime
-from quant.data import fetch_price_data
+from quant.data import fetch_price_data, price_cache
 from quant.backtest import backtest,run_all_backtests
-from quant.risk import sharpe_ratio, max_drawdown, compute_metrics
+from quant.risk import sharpe_ratio, max_drawdown
+from quant.rolling_risk import rolling_risk
+from quant.fingerprint import data_fingerprint, result_key
+from quant.signals import STRATEGIES
 from db.models import BacktestResult
-from db.session import get_db
+from db.session import get_db, SessionLocal
 from api.schemas import BacktestRequest
-from sqlalchemy import func
+from api.pipeline import run_all_backtests_async, cached_results
+from api.executor import ExecutorSaturated, compute_executor
+from api.batch import stream_batch
+from api.singleflight import backtest_flights
+from api.jobs import job_queue, FINISHED
+from sqlalchemy import func, case, or_, and_
+from urllib.parse import urlencode
+import numpy as np
+import asyncio
+import json
 import os
 
 router = APIRouter()
@@ -498,10 +511,7 @@ def get_run_all_backtests_page():
     return html_content
 
 @router.post("/run-all-backtests-api")
-async def run_all_backtests_api(
-    request: dict,
-    db: Session = Depends(get_db)
-):
+async def run_all_backtests_api(request: dict):
     """Run all backtests for a given ticker and save to database"""
     try:
         ticker = request.get('ticker', '').upper()
@@ -512,73 +522,94 @@ async def run_all_backtests_api(
             raise HTTPException(status_code=400, detail="Missing required fields")
         
         # Convert string dates to date objects
-        from datetime import datetime
         start = datetime.strptime(start_date, '%Y-%m-%d').date()
         end = datetime.strptime(end_date, '%Y-%m-%d').date()
         
-        # Run all backtests
-        backtest_results = run_all_backtests(ticker, start, end)
-        
-        results_list = []
-        
-        # Process and save each strategy result
-        for strategy_name, model in backtest_results.items():
-            equity = model['equity_curve']
-            returns = model['returns']
-            
-            final_equity, total_return, win_rate, num_trades = compute_metrics(
-                equity, returns
-            )
-            
-            # Create database record
-            result = BacktestResult(
-                ticker=ticker,
-                start_date=start,
-                end_date=end,
-                strategy_name=strategy_name,
-                sharpe_ratio=round(model['sharpe'], 3),
-                final_equity=round(final_equity, 4),
-                max_drawdown=round(model['max_drawdown'], 4) * 100,  # Store as percentage
-                total_return=round(total_return, 2),
-                win_rate=round(win_rate, 2),
-                num_trades=int(num_trades),
-                created_at=datetime.now()
-            )
-            
-            db.add(result)
-            
-            # Add to results list for display
-            results_list.append({
-                'strategy_name': strategy_name,
-                'sharpe_ratio': round(model['sharpe'], 3),
-                'final_equity': round(final_equity, 4),
-                'max_drawdown': round(model['max_drawdown'], 4) * 100,
-                'total_return': round(total_return, 2),
-                'win_rate': round(win_rate, 2),
-                'num_trades': int(num_trades)
-            })
-        
-        # Commit all results
-        db.commit()
+        # Run all backtests off the event loop, reusing stored results for identical inputs and data;
+        # simultaneous identical requests share one run
+        results_list, cached = await backtest_flights.do(
+            (ticker, start, end), run_all_backtests_async, ticker, start, end
+        )
         
         return {
             'ticker': ticker,
             'start_date': start_date,
             'end_date': end_date,
             'results': results_list,
+            'cached': cached,
             'message': f'Successfully ran {len(results_list)} backtests for {ticker}'
         }
         
+    except HTTPException:
+        raise
+    except ExecutorSaturated as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=f"Error running backtests: {str(e)}")
 
+@router.post("/run-backtests-batch")
+async def run_backtests_batch(request: dict):
+    """
+    Run strategies (default: all) for a list of tickers and stream each
+    (ticker, strategy) result as a line of JSON as soon as it is ready,
+    followed by a summary line. Failed tickers get an error line.
+    """
+    for field in ('tickers', 'strategies'):
+        values = request.get(field)
+        if values is not None and not (isinstance(values, list) and all(isinstance(v, str) for v in values)):
+            raise HTTPException(status_code=400, detail=f"{field} must be a list of strings")
+
+    tickers = list(dict.fromkeys(t.upper() for t in request.get('tickers') or []))
+    strategies = list(dict.fromkeys(request.get('strategies') or STRATEGIES))
+    start_date = request.get('start_date')
+    end_date = request.get('end_date')
+
+    if not tickers or not start_date or not end_date:
+        raise HTTPException(status_code=400, detail="Missing required fields")
+    unknown = [name for name in strategies if name not in STRATEGIES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown strategies: {', '.join(unknown)}")
+    try:
+        start = datetime.strptime(start_date, '%Y-%m-%d').date()
+        end = datetime.strptime(end_date, '%Y-%m-%d').date()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
+
+    # Once streaming starts the batch waits for capacity, so turn it away up front when already full
+    if compute_executor.full:
+        e = ExecutorSaturated(compute_executor.name)
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+    return StreamingResponse(stream_batch(tickers, strategies, start, end), media_type="application/x-ndjson")
+
+# Parameters of the /run-backtest rule (short when the 20-bar mean return is positive), for its cache key
+RUN_BACKTEST_PARAMS = {"rule": "mean_return_reversal", "window": 20}
+
 @router.post("/run-backtest")
 def run_backtest(req: BacktestRequest, db: Session = Depends(get_db)):
     try:
         df = fetch_price_data(req.ticker, req.start, req.end)
+
+        # Identical inputs on unchanged data return the stored result
+        cache_key = result_key(req.ticker, req.start, req.end, "Moving Average",
+                               RUN_BACKTEST_PARAMS, data_fingerprint(df))
+        stored = cached_results(db, [cache_key]).get(cache_key)
+        if stored is not None:
+            return {
+                "id": stored.id,
+                "ticker": stored.ticker,
+                "sharpe": stored.sharpe_ratio,
+                "final_equity": stored.final_equity,
+                "max_drawdown": stored.max_drawdown,
+                "total_return": stored.total_return,
+                "win_rate": stored.win_rate,
+                "num_trades": stored.num_trades,
+                "created_at": stored.created_at,
+                "cached": True
+            }
+
         signals = df['returns'].rolling(20).mean().apply(lambda x: -1 if x > 0 else 1)
         equity, strat_returns = backtest(df['returns'], signals)
 
@@ -607,6 +638,7 @@ def run_backtest(req: BacktestRequest, db: Session = Depends(get_db)):
             "total_return": float(total_ret),
             "win_rate": float(win_rate),
             "num_trades": int(num_trades),
+            "cache_key": cache_key,
             "created_at": datetime.utcnow()
         }
         BacktestResult_instance = BacktestResult(**result)
@@ -622,31 +654,23 @@ def run_backtest(req: BacktestRequest, db: Session = Depends(get_db)):
             "total_return": float(total_ret),
             "win_rate": float(win_rate),
             "num_trades": int(num_trades),
-            "created_at": BacktestResult_instance.created_at
+            "created_at": BacktestResult_instance.created_at,
+            "cached": False
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 
-@router.get("/backtest-results", response_class=HTMLResponse)
-def get_backtest_results(db: Session = Depends(get_db), limit: int = 100):
-    """Get all backtest results as HTML table"""
-    results = db.query(BacktestResult).order_by(BacktestResult.created_at.desc()).limit(limit).all()
-    
-    # Calculate summary stats
-    total = len(results)
-    avg_sharpe = sum(r.sharpe_ratio for r in results) / total if total > 0 else 0
-    profitable = sum(1 for r in results if r.total_return > 0)
-    success_rate = (profitable / total * 100) if total > 0 else 0
-    
-    # Generate table rows
-    rows_html = ""
-    for r in results:
-        sharpe_class = "excellent" if r.sharpe_ratio >= 1.5 else "good" if r.sharpe_ratio >= 1 else "average" if r.sharpe_ratio >= 0.5 else "poor"
-        return_class = "positive" if r.total_return >= 0 else "negative"
-        
-        rows_html += f"""
+# Rows rendered per streamed chunk of the /backtest-results table
+RESULT_ROWS_PER_CHUNK = 500
+
+def result_row_html(r):
+    """One <tr> of the /backtest-results table"""
+    sharpe_class = "excellent" if r.sharpe_ratio >= 1.5 else "good" if r.sharpe_ratio >= 1 else "average" if r.sharpe_ratio >= 0.5 else "poor"
+    return_class = "positive" if r.total_return >= 0 else "negative"
+
+    return f"""
         <tr>
             <td>{r.id}</td>
             <td><strong>{r.ticker}</strong></td>
@@ -662,8 +686,36 @@ def get_backtest_results(db: Session = Depends(get_db), limit: int = 100):
             <td>{r.created_at.strftime('%Y-%m-%d %H:%M')}</td>
         </tr>
         """
+
+def parse_results_cursor(cursor):
+    """'<created_at ISO>_<id>' -> (created_at, id) of the last row of the previous page"""
+    created_at, _, result_id = cursor.rpartition('_')
+    return datetime.fromisoformat(created_at), int(result_id)
+
+@router.get("/backtest-results", response_class=HTMLResponse)
+def get_backtest_results(db: Session = Depends(get_db), limit: int = 100, cursor: str = None):
+    """
+    Backtest results as an HTML table, newest first, `limit` rows per page.
+    `cursor` (from the page's Next link) continues after the previous page.
+    """
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be at least 1")
+    try:
+        after = parse_results_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # Summary stats over all stored results, aggregated by the database
+    total, avg_sharpe, profitable = db.query(
+        func.count(BacktestResult.id),
+        func.avg(BacktestResult.sharpe_ratio),
+        func.sum(case((BacktestResult.total_return > 0, 1), else_=0))
+    ).one()
+    avg_sharpe = avg_sharpe or 0
+    profitable = profitable or 0
+    success_rate = (profitable / total * 100) if total > 0 else 0
     
-    html_content = f"""
+    page_start = f"""
     <!DOCTYPE html>
     <html>
     <head>
@@ -881,6 +933,13 @@ def get_backtest_results(db: Session = Depends(get_db), limit: int = 100):
                 font-size: 14px;
             }}
             
+            .pagination {{
+                padding: 15px 20px;
+                display: flex;
+                justify-content: flex-end;
+                gap: 10px;
+            }}
+            
             .no-results {{
                 text-align: center;
                 padding: 40px;
@@ -969,8 +1028,10 @@ def get_backtest_results(db: Session = Depends(get_db), limit: int = 100):
                 <h2>All Backtest Results ({total} total)</h2>
             </div>
             <div class="table-wrapper">
-                {'<table id="resultsTable"><thead><tr><th>ID</th><th>Ticker</th><th>Strategy</th><th>Start Date</th><th>End Date</th><th>Sharpe Ratio</th><th>Total Return</th><th>Win Rate</th><th>Max Drawdown</th><th>Final Equity</th><th>Trades</th><th>Created</th></tr></thead><tbody>' + rows_html + '</tbody></table>' if total > 0 else '<div class="no-results">No backtest results found. Run some backtests to see data here!</div>'}
-            </div>
+                {'<table id="resultsTable"><thead><tr><th>ID</th><th>Ticker</th><th>Strategy</th><th>Start Date</th><th>End Date</th><th>Sharpe Ratio</th><th>Total Return</th><th>Win Rate</th><th>Max Drawdown</th><th>Final Equity</th><th>Trades</th><th>Created</th></tr></thead><tbody>' if total > 0 else '<div class="no-results">No backtest results found. Run some backtests to see data here!</div>'}
+    """
+
+    page_end = f"""
         </div>
         
         <script>
@@ -1067,8 +1128,51 @@ def get_backtest_results(db: Session = Depends(get_db), limit: int = 100):
     </body>
     </html>
     """
-    
-    return html_content
+
+    def render():
+        yield page_start
+        next_cursor = None
+        if total > 0:
+            # Own session: the request's is closed before the body is streamed
+            session = SessionLocal()
+            try:
+                query = session.query(BacktestResult).order_by(
+                    BacktestResult.created_at.desc(), BacktestResult.id.desc()
+                )
+                if after:
+                    query = query.filter(or_(
+                        BacktestResult.created_at < after[0],
+                        and_(BacktestResult.created_at == after[0], BacktestResult.id < after[1])
+                    ))
+
+                # One row past the page tells whether there is a next page
+                chunk = []
+                last = None
+                for n, r in enumerate(query.limit(limit + 1).yield_per(RESULT_ROWS_PER_CHUNK)):
+                    if n == limit:
+                        next_cursor = f"{last.created_at.isoformat()}_{last.id}"
+                        break
+                    chunk.append(result_row_html(r))
+                    last = r
+                    if len(chunk) == RESULT_ROWS_PER_CHUNK:
+                        yield "".join(chunk)
+                        chunk = []
+                yield "".join(chunk)
+            finally:
+                session.close()
+            yield "</tbody></table>"
+
+        links = []
+        if after:
+            links.append(f'<a href="/backtest-results?{urlencode({"limit": limit})}" class="btn btn-secondary">⇤ Newest</a>')
+        if next_cursor:
+            links.append(f'<a href="/backtest-results?{urlencode({"limit": limit, "cursor": next_cursor})}" class="btn">Next {limit} →</a>')
+        yield f"""
+            </div>
+            {'<div class="pagination">' + ''.join(links) + '</div>' if links else ''}"""
+        yield page_end
+
+    return StreamingResponse(render(), media_type="text/html")
 @router.get("/download-powerbi")
 def download_powerbi():
     """Download Power BI file if available"""
@@ -1276,4 +1380,116 @@ def get_dashboard_data(db: Session = Depends(get_db)):
             ]
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/cache-stats")
+def get_cache_stats():
+    """Hit/miss counters of the in-process price cache and coalesced backtest requests"""
+    return {
+        'price_cache': price_cache.stats(),
+        'backtest_flights': backtest_flights.stats()
+    }
+
+@router.get("/rolling-risk")
+def get_rolling_risk(ticker: str, start_date: str, end_date: str, window: int = 63,
+                     alpha: float = 0.05, strategy: str = None):
+    """
+    Rolling Sharpe, volatility, drawdowns, VaR and ES for a ticker (buy and
+    hold) or for one strategy's backtest on it. Values are null during the
+    warm-up window.
+    """
+    try:
+        start = datetime.strptime(start_date, '%Y-%m-%d').date()
+        end = datetime.strptime(end_date, '%Y-%m-%d').date()
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        if not 0 <= alpha <= 1:
+            raise ValueError("alpha must be between 0 and 1")
+
+        df = fetch_price_data(ticker.upper(), start, end)
+        if df.empty:
+            raise HTTPException(status_code=404, detail=f"No price data for {ticker}")
+
+        if strategy:
+            models = run_all_backtests(ticker.upper(), start, end, df=df)
+            if strategy not in models:
+                raise HTTPException(status_code=400, detail=f"Unknown strategy: {strategy}")
+            returns = models[strategy]['returns'].to_numpy()
+            equity = models[strategy]['equity_curve'].to_numpy()
+        else:
+            returns = df['returns'].to_numpy()
+            equity = (1 + df['returns']).cumprod().to_numpy()
+
+        series = rolling_risk(returns, equity, window=window, alpha=alpha)
+
+        return {
+            'ticker': ticker.upper(),
+            'strategy': strategy,
+            'window': window,
+            'alpha': alpha,
+            'dates': [d.strftime('%Y-%m-%d') for d in df.index],
+            **{
+                name: [round(v, 6) if np.isfinite(v) else None for v in values.tolist()]
+                for name, values in series.items()
+            }
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/jobs/run-all-backtests", status_code=202)
+def submit_run_all_backtests_job(request: dict):
+    """
+    Queue run-all-backtests for one ticker or a list of tickers and return the
+    job id at once. Poll GET /jobs/{job_id} or stream /jobs/{job_id}/events.
+    """
+    tickers = request.get('tickers') or ([request['ticker']] if request.get('ticker') else [])
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    start_date = request.get('start_date')
+    end_date = request.get('end_date')
+
+    if not tickers or not start_date or not end_date:
+        raise HTTPException(status_code=400, detail="Missing required fields")
+    try:
+        datetime.strptime(start_date, '%Y-%m-%d')
+        datetime.strptime(end_date, '%Y-%m-%d')
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid date format: {str(e)}")
+
+    return job_queue.submit('run_all_backtests', {
+        'tickers': tickers,
+        'start_date': start_date,
+        'end_date': end_date
+    })
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """Status, progress and (once done) result of a background job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request):
+    """Server-Sent Events with the job state on every status or progress change, until it finishes"""
+    if await asyncio.to_thread(job_queue.get, job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        last = None
+        while True:
+            job = await asyncio.to_thread(job_queue.get, job_id)
+            state = (job['status'], job['progress'])
+            if state != last:
+                last = state
+                yield f"event: {job['status']}\ndata: {json.dumps(jsonable_encoder(job))}\n\n"
+            if job['status'] in FINISHED or await request.is_disconnected():
+                break
+            await asyncio.sleep(0.5)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
@@ -0,0 +1,53 @@
+"""
+In-flight deduplication for async endpoints.
+
+Concurrent calls with the same key share one execution: the first caller
+(the leader) starts the work as a task, later callers await that task and
+receive the same result or exception. The key is forgotten as soon as the
+task finishes, so this coalesces simultaneous requests only; stored results
+are the result cache's job (api.pipeline).
+"""
+import asyncio
+
+
+class SingleFlight:
+    """Runs at most one coroutine per key at a time on the event loop"""
+
+    def __init__(self):
+        self._flights = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn, *args):
+        """Await fn(*args), or the call already running under key"""
+        task = self._flights.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn(*args))
+            self._flights[key] = task
+            task.add_done_callback(lambda t: self._finished(key, t))
+        else:
+            self.coalesced += 1
+
+        # Shielded so one caller disconnecting does not cancel the work the others wait for
+        return await asyncio.shield(task)
+
+    def _finished(self, key, task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            task.exception()  # Mark as retrieved in case every caller went away
+
+    def stats(self):
+        """Calls that ran the work, calls that joined one already running, and keys running now"""
+        calls = self.leaders + self.coalesced
+        return {
+            'leaders': self.leaders,
+            'coalesced': self.coalesced,
+            'coalesce_rate': self.coalesced / calls if calls > 0 else 0,
+            'in_flight': len(self._flights),
+        }
+
+
+# Run-all-backtests requests, keyed by (ticker, start date, end date)
+backtest_flights = SingleFlight()
@@ -0,0 +1,78 @@
+"""
+Benchmark quant.rolling_risk against pandas rolling windows.
+
+    python -m benchmarks.bench_rolling_risk --bars 20000 --window 63
+
+Returns are synthetic with flat stretches of zeros spliced in, like a
+strategy that is out of the market. Reports wall time of both versions and
+checks that Sharpe, volatility, VaR and ES match the pandas rolling results
+(NaN where pandas gives NaN, including the Sharpe of a flat window).
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from quant.risk import sharpe_ratio, value_at_risk, expected_shortfall
+from quant.rolling_risk import rolling_sharpe, rolling_volatility, rolling_var_es
+
+
+def flat_stretch_returns(bars, seed=0):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0004, 0.01, bars)
+    for start in rng.integers(0, bars, max(bars // 500, 1)):
+        returns[start:start + int(rng.integers(50, 300))] = 0.0
+    return returns
+
+
+def pandas_rolling(returns, window, alpha):
+    rolling = pd.Series(returns).rolling(window)
+    return {
+        'sharpe': rolling.apply(sharpe_ratio).to_numpy(),
+        # Two-pass std per window; rolling.std()'s running sums leave noise on flat windows
+        'volatility': (rolling.apply(lambda r: r.std(ddof=1), raw=True) * np.sqrt(252)).to_numpy(),
+        'var': rolling.apply(lambda r: value_at_risk(r, alpha), raw=True).to_numpy(),
+        'expected_shortfall': rolling.apply(lambda r: expected_shortfall(pd.Series(r), alpha), raw=True).to_numpy(),
+    }
+
+
+def fast_rolling(returns, window, alpha):
+    var, es = rolling_var_es(returns, window, alpha)
+    return {
+        'sharpe': rolling_sharpe(returns, window),
+        'volatility': rolling_volatility(returns, window),
+        'var': var,
+        'expected_shortfall': es,
+    }
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--bars', type=int, default=20_000)
+    parser.add_argument('--window', type=int, default=63)
+    parser.add_argument('--alpha', type=float, default=0.05)
+    args = parser.parse_args()
+
+    returns = flat_stretch_returns(args.bars)
+    expected, pandas_time = timed(pandas_rolling, returns, args.window, args.alpha)
+    actual, fast_time = timed(fast_rolling, returns, args.window, args.alpha)
+
+    for name in expected:
+        if not np.allclose(actual[name], expected[name], rtol=1e-7, atol=1e-12, equal_nan=True):
+            raise SystemExit(f"Rolling {name} does not match pandas")
+
+    print(f"{'':<12} {'seconds':>10}")
+    print(f"{'pandas':<12} {pandas_time:>10.3f}")
+    print(f"{'rolling_risk':<12} {fast_time:>10.3f}")
+    print(f"Speed-up {pandas_time / fast_time:.0f}x; all series match pandas")
+
+
+if __name__ == "__main__":
+    main()
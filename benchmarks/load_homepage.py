@@ -0,0 +1,146 @@
+"""
+Load test: homepage latency while backtests run.
+
+    python -m benchmarks.load_homepage --serve
+    python -m benchmarks.load_homepage --url http://127.0.0.1:8000 --tickers AAPL MSFT NVDA
+
+Measures GET / and GET /dashboard-data latency from a few polling clients,
+first on an idle server and then while other clients keep POSTing
+/run-all-backtests-api. With --serve it starts its own uvicorn server on the
+synthetic price provider and a throwaway SQLite database, so every backtest
+ticker (LOAD0, LOAD1, ...) is new and actually computed.
+"""
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+HOMEPAGE_PATHS = ('/', '/dashboard-data')
+
+
+def request(url, body=None, timeout=120):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - start
+
+
+def poll_homepage(url, seconds, clients):
+    """Latencies (seconds) of homepage requests from `clients` pollers for `seconds`"""
+    deadline = time.perf_counter() + seconds
+
+    def poller(_):
+        latencies = []
+        for path in itertools.cycle(HOMEPAGE_PATHS):
+            if time.perf_counter() > deadline:
+                return latencies
+            latencies.append(request(url + path)[1])
+
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        return np.array([x for latencies in pool.map(poller, range(clients)) for x in latencies])
+
+
+def backtest_load(url, tickers, clients, stop, statuses):
+    """Keep `clients` backtest requests in flight until stop is set"""
+    counter = itertools.count()
+
+    def client(_):
+        while not stop.is_set():
+            ticker = tickers[next(counter) % len(tickers)] if tickers else f"LOAD{next(counter)}"
+            body = {'ticker': ticker, 'start_date': '2005-01-01', 'end_date': '2024-12-31'}
+            status, _ = request(url + '/run-all-backtests-api', body)
+            statuses[status] += 1
+            if status == 429:
+                time.sleep(0.5)
+
+    pool = ThreadPoolExecutor(max_workers=clients)
+    for i in range(clients):
+        pool.submit(client, i)
+    return pool
+
+
+def report(name, latencies):
+    ms = latencies * 1000
+    print(f"{name:<12} n={len(ms):<6} p50={np.percentile(ms, 50):8.1f}ms  p95={np.percentile(ms, 95):8.1f}ms  "
+          f"p99={np.percentile(ms, 99):8.1f}ms  max={ms.max():8.1f}ms")
+
+
+def serve(port):
+    workdir = tempfile.mkdtemp(prefix='load_homepage_')
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'load.db')}",
+        PRICE_PROVIDER='synthetic',
+        PRICE_CACHE_DIR=os.path.join(workdir, 'prices'),
+    )
+    subprocess.run([sys.executable, '-m', 'db.init_db'], env=env, check=True, stdout=subprocess.DEVNULL)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(port), '--log-level', 'warning'], env=env
+    )
+
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            request(url + '/', timeout=1)
+            return server, url
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("The server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--serve', action='store_true', help='start a local server on the synthetic provider')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--pollers', type=int, default=4)
+    parser.add_argument('--backtesters', type=int, default=8)
+    parser.add_argument('--tickers', nargs='*', help='tickers to backtest (default: new synthetic tickers)')
+    args = parser.parse_args()
+
+    server = None
+    url = args.url.rstrip('/')
+    if args.serve:
+        server, url = serve(args.port)
+
+    try:
+        idle = poll_homepage(url, args.seconds, args.pollers)
+
+        stop = threading.Event()
+        statuses = Counter()
+        load = backtest_load(url, args.tickers, args.backtesters, stop, statuses)
+        loaded = poll_homepage(url, args.seconds, args.pollers)
+        stop.set()
+        load.shutdown(wait=True)
+
+        report('idle', idle)
+        report('backtesting', loaded)
+        print(f"p95 ratio (backtesting / idle): {np.percentile(loaded, 95) / np.percentile(idle, 95):.2f}")
+        print("backtest responses:", dict(sorted(statuses.items())))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,48 @@
-from models import Base
-from session import engine
+from sqlalchemy import inspect, text
+
+from db.models import Base, BacktestResult, MarketData
+from db.session import engine
+
+def add_cache_key_column():
+    """Add backtest_results.cache_key to tables created before it existed"""
+    columns = {c['name'] for c in inspect(engine).get_columns(BacktestResult.__tablename__)}
+    if 'cache_key' in columns:
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE {BacktestResult.__tablename__} ADD cache_key VARCHAR(64)"))
+    for index in BacktestResult.__table__.indexes:
+        if 'cache_key' in index.columns:
+            index.create(bind=engine)
+    print("Added cache_key column to backtest_results")
+
+def recreate_legacy_market_data():
+    """Recreate market_data tables created before it was keyed by (ticker, date)"""
+    table = MarketData.__tablename__
+    columns = {c['name'] for c in inspect(engine).get_columns(table)}
+    if 'ticker' in columns:
+        return
+
+    with engine.begin() as conn:
+        if conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar():
+            raise RuntimeError(f"Legacy {table} table has rows; migrate or drop it by hand")
+        conn.execute(text(f"DROP TABLE {table}"))
+        MarketData.__table__.create(bind=conn)
+    print(f"Recreated {table} with (ticker, date) keys")
+
+def add_pagination_index():
+    """Create the (created_at, id) index on backtest_results tables created before it existed"""
+    for index in BacktestResult.__table__.indexes:
+        if index.name == "ix_backtest_results_created_at_id":
+            index.create(bind=engine, checkfirst=True)
 
 def init_database():
     """Create all tables in the database"""
     Base.metadata.create_all(bind=engine)
+    add_cache_key_column()
+    add_pagination_index()
+    recreate_legacy_market_data()
     print("Database tables created successfully!")
 
 if __name__ == "__main__":
-    init_database()
\ No newline at end of file
+    init_database()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, Date, String, DateTime
+from sqlalchemy import Column, Integer, Float, Date, String, DateTime, Text, Index
 from datetime import datetime
 
 from sqlalchemy.ext.declarative import declarative_base
@@ -7,10 +7,17 @@ Base = declarative_base()
 
 class MarketData(Base):
     __tablename__ = "market_data"
-    id = Column(Integer, primary_key=True)
-    date = Column(Date)
-    price = Column(Float)
-    returns = Column(Float)
+    # The (ticker, date) primary key doubles as the index for range reads
+    ticker = Column(String(10), primary_key=True)
+    date = Column(Date, primary_key=True)
+    price = Column(Float, nullable=False)
+    volume = Column(Float)
+class MarketDataCoverage(Base):
+    __tablename__ = "market_data_coverage"
+    # Date range [start_date, end_date) already fetched into market_data
+    ticker = Column(String(10), primary_key=True)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
 class BacktestResult(Base):
     __tablename__ = "backtest_results"
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -24,4 +31,23 @@ class BacktestResult(Base):
     total_return = Column(Float)
     win_rate = Column(Float)
     num_trades = Column(Integer)
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    # Hash of the inputs and price data the result was computed from (quant.fingerprint.result_key)
+    cache_key = Column(String(64), index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    # /backtest-results pages newest first by seeking on (created_at, id)
+    __table_args__ = (Index("ix_backtest_results_created_at_id", "created_at", "id"),)
+class BacktestJob(Base):
+    __tablename__ = "backtest_jobs"
+    id = Column(String(36), primary_key=True)
+    kind = Column(String(50), nullable=False)
+    # queued -> running -> done / failed
+    status = Column(String(20), nullable=False, default="queued", index=True)
+    payload = Column(Text, nullable=False)  # JSON
+    result = Column(Text)  # JSON
+    error = Column(Text)
+    progress = Column(Float, default=0.0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    # Touched on every state change; running jobs that stop updating are requeued on startup
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,84 @@
+import pandas as pd
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from db.models import MarketData, MarketDataCoverage
+from db.session import SessionLocal
+from quant.store import PriceStore, empty_frame
+
+# SQL Server allows at most 2100 parameters per statement
+DELETE_BATCH_SIZE = 1000
+
+
+class DatabasePriceStore(PriceStore):
+    """
+    Price store backed by the market_data table, so every API worker shares
+    one warm copy of the prices instead of each downloading them.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        super().__init__()
+        self.session_factory = session_factory
+
+    def coverage(self, ticker):
+        db = self.session_factory()
+        try:
+            row = db.get(MarketDataCoverage, ticker.upper())
+            if row is None:
+                return None
+            return pd.Timestamp(row.start_date), pd.Timestamp(row.end_date)
+        finally:
+            db.close()
+
+    def read(self, ticker, start, end):
+        db = self.session_factory()
+        try:
+            rows = db.execute(
+                select(MarketData.date, MarketData.price, MarketData.volume)
+                .where(MarketData.ticker == ticker.upper())
+                .where(MarketData.date >= start.date())
+                .where(MarketData.date < end.date())
+                .order_by(MarketData.date)
+            ).all()
+        finally:
+            db.close()
+
+        if not rows:
+            return empty_frame()
+
+        dates, prices, volumes = zip(*rows)
+        index = pd.DatetimeIndex(pd.to_datetime(dates), name='Date')
+        return pd.DataFrame({'price': prices, 'volume': volumes}, index=index)
+
+    def write(self, ticker, df, coverage):
+        ticker = ticker.upper()
+        df = df.sort_index()
+        rows = [
+            {'ticker': ticker, 'date': ts.date(), 'price': float(price), 'volume': float(volume)}
+            for ts, price, volume in zip(df.index, df['price'], df['volume'])
+        ]
+
+        db = self.session_factory()
+        try:
+            # Upsert: bulk delete the fetched dates, then insert them all in one executemany
+            dates = [row['date'] for row in rows]
+            for i in range(0, len(dates), DELETE_BATCH_SIZE):
+                db.execute(
+                    delete(MarketData)
+                    .where(MarketData.ticker == ticker)
+                    .where(MarketData.date.in_(dates[i:i + DELETE_BATCH_SIZE]))
+                )
+            if rows:
+                db.execute(insert(MarketData), rows)
+
+            db.merge(MarketDataCoverage(
+                ticker=ticker,
+                start_date=coverage[0].date(),
+                end_date=coverage[1].date()
+            ))
+            db.commit()
+        except IntegrityError:
+            # Another worker stored the same rows first; theirs are just as good
+            db.rollback()
+        finally:
+            db.close()
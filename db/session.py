@@ -2,7 +2,10 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from db.config import DATABASE_URL
 
-engine = create_engine(DATABASE_URL, echo=False)
+# pyodbc sends bulk inserts row by row unless fast_executemany is enabled
+engine_options = {"fast_executemany": True} if DATABASE_URL.startswith("mssql+pyodbc") else {}
+
+engine = create_engine(DATABASE_URL, echo=False, **engine_options)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 
 def get_db():
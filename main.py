@@ -1,8 +1,20 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.responses import HTMLResponse
 from api.routes import router
+from api.jobs import job_queue
+from api.executor import io_executor, compute_executor
 
-app = FastAPI(title="Quant Research Platform")
+@asynccontextmanager
+async def lifespan(app):
+    # Background backtest workers; queued jobs left from a previous run are picked up here
+    job_queue.start()
+    yield
+    job_queue.stop()
+    io_executor.shutdown()
+    compute_executor.shutdown()
+
+app = FastAPI(title="Quant Research Platform", lifespan=lifespan)
 
 @app.get("/", response_class=HTMLResponse)
 def home():
@@ -0,0 +1,212 @@
+"""
+Mergeable metric accumulators for return streams.
+
+Each accumulator keeps a few numbers instead of the series. update() adds one
+return, update_many() adds a chunk with vectorized NumPy, and merge() folds in
+the state of an accumulator that saw the returns immediately following this
+one's. Chunked out-of-core runs and parallel workers therefore combine to the
+same metrics (up to floating point rounding) as one pass over the full series
+with quant.risk. Missing returns are skipped like pandas does, except that
+trade counts include them like compute_metrics.
+"""
+import math
+
+import numpy as np
+
+
+class ReturnMoments:
+    """Count, mean and sum of squared deviations (Welford, merged with Chan et al.)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, value):
+        if value != value:
+            return self
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        return self
+
+    def update_many(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            chunk = ReturnMoments()
+            chunk.count = len(values)
+            chunk.mean = float(values.mean())
+            chunk.m2 = float(np.square(values - chunk.mean).sum())
+            self.merge(chunk)
+        return self
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        return self
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else float('nan')
+
+    def sharpe(self, rf=0, periods_per_year=252):
+        """Annualized Sharpe ratio, as quant.risk.sharpe_ratio"""
+        std = math.sqrt(self.variance) if self.count > 1 else float('nan')
+        if std == 0:
+            return float('nan') if self.mean == rf else math.copysign(float('inf'), self.mean - rf)
+        return (self.mean - rf) / std * math.sqrt(periods_per_year)
+
+
+class DrawdownState:
+    """
+    Equity path summary relative to the equity before the first return:
+    growth (final equity), peak, trough and max_drawdown. Like
+    quant.risk.max_drawdown, the starting capital is not a peak; only the
+    equity after each return is.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.growth = 1.0
+        self.peak = float('nan')
+        self.trough = float('nan')
+        self.max_drawdown = float('nan')
+
+    def update(self, value):
+        if value != value:
+            return self
+        self.growth *= 1 + value
+        if self.count == 0:
+            self.peak = self.trough = self.growth
+            self.max_drawdown = 0.0
+        else:
+            self.peak = max(self.peak, self.growth)
+            self.trough = min(self.trough, self.growth)
+            self.max_drawdown = max(self.max_drawdown, (self.peak - self.growth) / self.peak)
+        self.count += 1
+        return self
+
+    def update_many(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            equity = np.cumprod(1 + values)
+            peak = np.maximum.accumulate(equity)
+
+            chunk = DrawdownState()
+            chunk.count = len(values)
+            chunk.growth = float(equity[-1])
+            chunk.peak = float(peak[-1])
+            chunk.trough = float(equity.min())
+            chunk.max_drawdown = float(((peak - equity) / peak).max())
+            self.merge(chunk)
+        return self
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.growth = other.count, other.growth
+            self.peak, self.trough, self.max_drawdown = other.peak, other.trough, other.max_drawdown
+            return self
+
+        # The deepest fall from this segment's peak into the other segment is to its trough.
+        # Points after the other segment sets a new high are covered by its own max drawdown.
+        across = (self.peak - self.growth * other.trough) / self.peak
+        self.max_drawdown = max(self.max_drawdown, other.max_drawdown, across)
+
+        self.peak = max(self.peak, self.growth * other.peak)
+        self.trough = min(self.trough, self.growth * other.trough)
+        self.growth *= other.growth
+        self.count += other.count
+        return self
+
+
+class TradeCounts:
+    """Winning and total (non-zero) return counts, as in compute_metrics"""
+
+    def __init__(self):
+        self.winning = 0
+        self.trades = 0
+
+    def update(self, value):
+        # NaN != 0, so missing returns count as trades like compute_metrics
+        self.winning += value > 0
+        self.trades += value != 0
+        return self
+
+    def update_many(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        self.winning += int((values > 0).sum())
+        self.trades += int((values != 0).sum())
+        return self
+
+    def merge(self, other):
+        self.winning += other.winning
+        self.trades += other.trades
+        return self
+
+    @property
+    def win_rate(self):
+        return self.winning / self.trades * 100 if self.trades > 0 else 0
+
+
+class MetricsAccumulator:
+    """
+    All stream metrics together:
+
+        acc = MetricsAccumulator()
+        for chunk in chunks:
+            acc.update_many(chunk)
+        acc.merge(other_worker_acc)
+        acc.result()
+    """
+
+    def __init__(self):
+        self.moments = ReturnMoments()
+        self.drawdown = DrawdownState()
+        self.counts = TradeCounts()
+
+    def update(self, value):
+        value = float(value)
+        self.moments.update(value)
+        self.drawdown.update(value)
+        self.counts.update(value)
+        return self
+
+    def update_many(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        self.moments.update_many(values)
+        self.drawdown.update_many(values)
+        self.counts.update_many(values)
+        return self
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.drawdown.merge(other.drawdown)
+        self.counts.merge(other.counts)
+        return self
+
+    def result(self, rf=0, periods_per_year=252):
+        """Metrics with the same names and units as quant.risk.performance_metrics"""
+        final_equity = self.drawdown.growth if self.drawdown.count else float('nan')
+        return {
+            'final_equity': final_equity,
+            'total_return': (final_equity - 1) * 100,
+            'sharpe': self.moments.sharpe(rf, periods_per_year),
+            'max_drawdown': self.drawdown.max_drawdown,
+            'win_rate': self.counts.win_rate,
+            'num_trades': self.counts.trades,
+        }
@@ -1,69 +1,80 @@
+import numpy as np
+import pandas as pd
 from quant.data import fetch_price_data
-from quant.risk import sharpe_ratio, max_drawdown
-from quant.strategies import (
-    moving_average_strategy,
-    rsi_strategy,
-    macd_strategy,
-    bollinger_bands_strategy
-)
+from quant.indicators import IndicatorCache
+from quant.risk import performance_metrics
+from quant.signals import STRATEGIES
 
 def backtest(returns, signals):
     strategy_returns = signals.shift(1) * returns
     equity_curve = (1 + strategy_returns).cumprod()
     return equity_curve, strategy_returns
-def run_all_backtests(ticker, start, end):
+
+def backtest_matrix(returns, signals):
+    """
+    Backtest K strategies at once: signals is a (bars x K) matrix sharing one
+    return vector. Returns (equity, strategy_returns) as C-contiguous
+    (bars x K) float64 arrays with the same values as backtest() per column,
+    including the NaN first row.
     """
-    Runs backtests for 4 strategies and returns a model dictionary
+    returns = np.asarray(returns, dtype=np.float64)
+    signals = np.asarray(signals)
+    if signals.ndim == 1:
+        signals = signals[:, None]
+
+    strategy_returns = np.empty(signals.shape, dtype=np.float64)
+    strategy_returns[:1] = np.nan
+    np.multiply(signals[:-1], returns[1:, None], out=strategy_returns[1:])
+
+    equity = np.empty_like(strategy_returns)
+    equity[:1] = np.nan
+    body = equity[1:]
+    np.add(strategy_returns[1:], 1.0, out=body)
+    missing = np.isnan(body)
+    if missing.any():
+        # cumprod that skips missing returns like pandas does
+        body[missing] = 1.0
+        np.cumprod(body, axis=0, out=body)
+        body[missing] = np.nan
+    else:
+        np.cumprod(body, axis=0, out=body)
+
+    return equity, strategy_returns
+
+def run_all_backtests(ticker, start, end, df=None):
+    """
+    Runs backtests for 4 strategies and returns a model dictionary with each
+    strategy's equity curve, returns and the compute_metrics values.
+    Pass df to reuse already fetched price data, e.g. PricePanel.frame(ticker).
     """
 
-    df = fetch_price_data(ticker, start, end)
+    if df is None:
+        df = fetch_price_data(ticker, start, end)
 
     returns = df['returns']
+    price = df['price'].to_numpy(dtype=np.float64)
 
-    backtest_models = {}
-
-
-    ma_df = moving_average_strategy(df)
-    equity, strat_returns = backtest(returns, ma_df['signal'])
-
-    backtest_models['Moving Average'] = {
-        'equity_curve': equity,
-        'returns': strat_returns,
-        'sharpe': sharpe_ratio(strat_returns),
-        'max_drawdown': max_drawdown(equity)
-    }
+    # Shared by all strategies so common indicators are computed once
+    indicators = IndicatorCache(price=price)
 
+    names = list(STRATEGIES)
+    signals = np.column_stack([STRATEGIES[name](price, cache=indicators) for name in names])
 
-    rsi_df = rsi_strategy(df)
-    equity, strat_returns = backtest(returns, rsi_df['signal'])
+    equity, strat_returns = backtest_matrix(returns.to_numpy(), signals)
+    metrics = performance_metrics(equity, strat_returns, alpha=None)
 
-    backtest_models['RSI'] = {
-        'equity_curve': equity,
-        'returns': strat_returns,
-        'sharpe': sharpe_ratio(strat_returns),
-        'max_drawdown': max_drawdown(equity)
-    }
-
-
-    macd_df = macd_strategy(df)
-    equity, strat_returns = backtest(returns, macd_df['signal'])
-
-    backtest_models['MACD'] = {
-        'equity_curve': equity,
-        'returns': strat_returns,
-        'sharpe': sharpe_ratio(strat_returns),
-        'max_drawdown': max_drawdown(equity)
-    }
-
-
-    bb_df = bollinger_bands_strategy(df)
-    equity, strat_returns = backtest(returns, bb_df['signal'])
+    backtest_models = {}
 
-    backtest_models['Bollinger Bands'] = {
-        'equity_curve': equity,
-        'returns': strat_returns,
-        'sharpe': sharpe_ratio(strat_returns),
-        'max_drawdown': max_drawdown(equity)
-    }
+    for k, name in enumerate(names):
+        backtest_models[name] = {
+            'equity_curve': pd.Series(equity[:, k], index=df.index),
+            'returns': pd.Series(strat_returns[:, k], index=df.index),
+            'sharpe': metrics['sharpe'][k],
+            'max_drawdown': metrics['max_drawdown'][k],
+            'final_equity': metrics['final_equity'][k],
+            'total_return': metrics['total_return'][k],
+            'win_rate': metrics['win_rate'][k],
+            'num_trades': metrics['num_trades'][k]
+        }
 
     return backtest_models
\ No newline at end of file
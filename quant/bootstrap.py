@@ -0,0 +1,159 @@
+"""
+Bootstrap confidence intervals for strategy performance.
+
+Strategy returns are resampled thousands of times with the stationary
+bootstrap (random geometric block lengths), a circular moving block
+bootstrap or a plain iid bootstrap (Monte Carlo draws from the empirical
+distribution). Resamples are built as index matrices in memory-bounded
+chunks; all strategies of a (bars x strategies) return matrix share the same
+indices so their cross-correlation is kept, and each chunk is evaluated with
+the fused quant.risk.performance_metrics kernel.
+
+Chunks get independent random streams spawned from one SeedSequence, so the
+results for a given seed are the same however many worker processes run
+them.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from quant.config import BACKTEST_WORKERS
+from quant.risk import performance_metrics
+
+METHODS = ('stationary', 'block', 'iid')
+
+# Upper bound on the number of float64 cells in one (bars x resamples*strategies) block
+MAX_BLOCK_CELLS = 4_000_000
+
+BOOTSTRAP_METRICS = ('sharpe', 'max_drawdown', 'final_equity')
+
+
+def resample_indices(rng, n_resamples, n_bars, method='stationary', block_size=20):
+    """(n_resamples x n_bars) matrix of row indices into the original returns"""
+    if method == 'iid':
+        return rng.integers(0, n_bars, (n_resamples, n_bars))
+
+    if method == 'block':
+        n_blocks = -(-n_bars // block_size)
+        starts = rng.integers(0, n_bars, (n_resamples, n_blocks, 1))
+        idx = (starts + np.arange(block_size)).reshape(n_resamples, -1)[:, :n_bars]
+        return idx % n_bars
+
+    if method == 'stationary':
+        # A new block starts at each bar with probability 1 / block_size (geometric lengths)
+        positions = np.arange(n_bars)
+        new_block = rng.random((n_resamples, n_bars)) < 1.0 / block_size
+        new_block[:, 0] = True
+        block_start = np.maximum.accumulate(np.where(new_block, positions, 0), axis=1)
+        starts = rng.integers(0, n_bars, (n_resamples, n_bars))
+        idx = np.take_along_axis(starts, block_start, axis=1) + (positions - block_start)
+        return idx % n_bars
+
+    raise ValueError(f"Unknown bootstrap method: {method}")
+
+
+def _resample_metrics(returns, n_resamples, seed, method, block_size, periods_per_year):
+    """Metrics of n_resamples resamples, each shaped (n_resamples, strategies)"""
+    rng = np.random.default_rng(seed)
+    n_bars, n_strategies = returns.shape
+
+    idx = resample_indices(rng, n_resamples, n_bars, method, block_size)
+    # (bars, resamples, strategies) -> one column per resample and strategy
+    sample = returns[idx.T].reshape(n_bars, n_resamples * n_strategies)
+    equity = np.cumprod(1 + sample, axis=0)
+
+    metrics = performance_metrics(equity, sample, alpha=None, periods_per_year=periods_per_year)
+    return {name: metrics[name].reshape(n_resamples, n_strategies) for name in BOOTSTRAP_METRICS}
+
+
+# Returns a worker process resamples from, sent once in the pool initializer
+_worker_returns = None
+
+
+def _init_worker(returns):
+    global _worker_returns
+    _worker_returns = returns
+
+
+def _run_chunk(n_resamples, seed, method, block_size, periods_per_year):
+    return _resample_metrics(_worker_returns, n_resamples, seed, method, block_size, periods_per_year)
+
+
+def bootstrap_returns(returns, n_resamples=10000, method='stationary', block_size=20, confidence=0.95,
+                      seed=None, max_workers=None, periods_per_year=252):
+    """
+    Bootstrap Sharpe ratio, max drawdown and final equity of strategy returns.
+
+    returns is a 1-D array/Series or a (bars x strategies) matrix; rows with
+    a missing value (e.g. the first bar of a backtest) are dropped. Returns
+    {metric: {'estimate', 'std_error', 'lower', 'upper'}} with the
+    percentile confidence interval at `confidence`; the Sharpe entry also has
+    'p_value', the share of resamples with a Sharpe ratio at or below zero.
+    Values are scalars for 1-D input and per-strategy arrays otherwise.
+
+    max_workers defaults to BACKTEST_WORKERS (or the CPU count); with one
+    worker everything runs in this process.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    single = returns.ndim == 1
+    if single:
+        returns = returns[:, None]
+    returns = np.ascontiguousarray(returns[~np.isnan(returns).any(axis=1)])
+
+    n_bars, n_strategies = returns.shape
+    if n_bars < 2:
+        raise ValueError("Need at least two bars of returns to bootstrap")
+    if n_resamples < 1:
+        raise ValueError("n_resamples must be at least 1")
+    if method not in METHODS:
+        raise ValueError(f"Unknown bootstrap method: {method}")
+
+    chunk_size = max(1, MAX_BLOCK_CELLS // (n_bars * n_strategies))
+    sizes = [min(chunk_size, n_resamples - start) for start in range(0, n_resamples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(size, s, method, block_size, periods_per_year) for size, s in zip(sizes, seeds)]
+
+    workers = max_workers or BACKTEST_WORKERS or os.cpu_count() or 1
+    if workers == 1 or len(args) == 1:
+        chunks = [_resample_metrics(returns, *a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(args)), initializer=_init_worker,
+                                 initargs=(returns,)) as pool:
+            chunks = list(pool.map(_run_chunk, *zip(*args)))
+
+    equity = np.cumprod(1 + returns, axis=0)
+    estimate = performance_metrics(equity, returns, alpha=None, periods_per_year=periods_per_year)
+
+    tail = (1 - confidence) / 2 * 100
+    result = {}
+    for name in BOOTSTRAP_METRICS:
+        samples = np.concatenate([chunk[name] for chunk in chunks])
+        lower, upper = np.nanpercentile(samples, [tail, 100 - tail], axis=0)
+        result[name] = {
+            'estimate': estimate[name],
+            'std_error': np.nanstd(samples, axis=0, ddof=1) if n_resamples > 1 else np.full(n_strategies, np.nan),
+            'lower': lower,
+            'upper': upper,
+        }
+        if name == 'sharpe':
+            result[name]['p_value'] = (samples <= 0).mean(axis=0)
+
+    if single:
+        return {name: {stat: values[0] for stat, values in stats.items()} for name, stats in result.items()}
+    return result
+
+
+def bootstrap_strategies(backtest_models, **kwargs):
+    """
+    Bootstrap every strategy of a run_all_backtests result together.
+    Returns {strategy_name: bootstrap_returns result for that strategy}.
+    """
+    names = list(backtest_models)
+    returns = np.column_stack([backtest_models[name]['returns'].to_numpy() for name in names])
+    result = bootstrap_returns(returns, **kwargs)
+
+    return {
+        name: {metric: {stat: values[k] for stat, values in stats.items()} for metric, stats in result.items()}
+        for k, name in enumerate(names)
+    }
@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+
+class PriceFrameCache:
+    """
+    Bounded in-process LRU cache of raw price frames keyed by ticker
+    (case-insensitive, like the price stores).
+
+    Each ticker keeps the widest date range fetched so far, and any sub-range
+    is served by slicing it. Entries are evicted least recently used first
+    once max_bytes is exceeded. Bars from the last recent_days days can still
+    change, so requests reaching into them are only served from entries
+    younger than ttl seconds.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, ttl=900, recent_days=5):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.recent_days = recent_days
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _is_recent(self, end):
+        return end > pd.Timestamp.today().normalize() - pd.Timedelta(days=self.recent_days)
+
+    def get(self, ticker, start, end):
+        """Return the cached rows in [start, end), or None on a miss"""
+        ticker = ticker.upper()
+        with self._lock:
+            entry = self._entries.get(ticker)
+            if entry is None or start < entry['start'] or end > entry['end']:
+                self.misses += 1
+                return None
+
+            if self._is_recent(end) and time.monotonic() - entry['stored_at'] > self.ttl:
+                self._remove(ticker)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(ticker)
+            self.hits += 1
+            df = entry['frame']
+
+        return df[(df.index >= start) & (df.index < end)]
+
+    def put(self, ticker, df, start, end):
+        """Store rows fetched for [start, end), merging with an overlapping cached range"""
+        ticker = ticker.upper()
+        with self._lock:
+            stored_at = time.monotonic()
+            entry = self._entries.get(ticker)
+            if entry is not None and start <= entry['end'] and end >= entry['start']:
+                # The newest cached bars keep their age unless this fetch refreshed them
+                if entry['end'] > end:
+                    stored_at = entry['stored_at']
+                merged = pd.concat([entry['frame'], df])
+                df = merged[~merged.index.duplicated(keep='last')].sort_index()
+                start, end = min(start, entry['start']), max(end, entry['end'])
+
+            if entry is not None:
+                self._remove(ticker)
+
+            size = int(df.memory_usage(index=True).sum())
+            self._entries[ticker] = {
+                'frame': df,
+                'start': start,
+                'end': end,
+                'size': size,
+                'stored_at': stored_at,
+            }
+            self._bytes += size
+
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, ticker):
+        entry = self._entries.pop(ticker)
+        self._bytes -= entry['size']
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Hit/miss counters and current size, for tuning under load"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups > 0 else 0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
@@ -0,0 +1,27 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Directory for the on-disk per-ticker price cache. Set to an empty string to disable it.
+PRICE_CACHE_DIR = os.getenv("PRICE_CACHE_DIR", ".price_cache")
+
+# Price source used by fetch_price_data: "yahoo", "files" or "synthetic"
+PRICE_PROVIDER = os.getenv("PRICE_PROVIDER", "yahoo")
+
+# Directory of <TICKER>.csv / <TICKER>.parquet files for the "files" provider
+PRICE_DATA_DIR = os.getenv("PRICE_DATA_DIR", "data")
+
+# Seed for the "synthetic" provider
+PRICE_SYNTHETIC_SEED = int(os.getenv("PRICE_SYNTHETIC_SEED", "0"))
+
+# In-process price frame cache: size limit in megabytes and freshness (seconds) for recent bars
+PRICE_MEMORY_CACHE_MB = int(os.getenv("PRICE_MEMORY_CACHE_MB", "256"))
+PRICE_MEMORY_CACHE_TTL = int(os.getenv("PRICE_MEMORY_CACHE_TTL", "900"))
+
+# Persistent price store in front of remote providers: "parquet", "mmap", "database" or "none".
+# The parquet and mmap stores live in PRICE_CACHE_DIR.
+PRICE_STORE = os.getenv("PRICE_STORE", "parquet")
+
+# Worker processes for quant.parallel.run_backtests; 0 uses the CPU count
+BACKTEST_WORKERS = int(os.getenv("BACKTEST_WORKERS", "0"))
@@ -1,20 +1,118 @@
-import yfinance as yf
-import pandas as pd
+from quant.cache import PriceFrameCache
+from quant.config import (
+    PRICE_CACHE_DIR, PRICE_PROVIDER, PRICE_DATA_DIR, PRICE_SYNTHETIC_SEED,
+    PRICE_MEMORY_CACHE_MB, PRICE_MEMORY_CACHE_TTL, PRICE_STORE
+)
+from quant.providers import YahooFinanceProvider, FileProvider, SyntheticProvider
+from quant.panel import PricePanel
+from quant.mmap_store import MmapPriceStore
+from quant.store import ParquetPriceStore, to_timestamp
 
-def fetch_price_data(ticker, start, end):
-    df = yf.download(ticker, start=start, end=end, auto_adjust=True)
+def _default_store():
+    if PRICE_STORE == "parquet":
+        return ParquetPriceStore(PRICE_CACHE_DIR) if PRICE_CACHE_DIR else None
+    if PRICE_STORE == "mmap":
+        return MmapPriceStore(PRICE_CACHE_DIR) if PRICE_CACHE_DIR else None
+    if PRICE_STORE == "database":
+        # Imported here so the quant package only needs a database when configured to use one
+        from db.price_store import DatabasePriceStore
+        return DatabasePriceStore()
+    if PRICE_STORE == "none":
+        return None
+    raise ValueError(f"Unknown price store: {PRICE_STORE}")
 
-    if 'Adj Close' in df.columns:
-        price_col = 'Adj Close'
-    elif 'Close' in df.columns:
-        price_col = 'Close'
-    else:
-        raise ValueError(f"No price column found for {ticker}")
+price_store = _default_store()
+price_cache = PriceFrameCache(max_bytes=PRICE_MEMORY_CACHE_MB * 1024 * 1024, ttl=PRICE_MEMORY_CACHE_TTL)
 
-    df = df[[price_col, 'Volume']].copy()
-    df.columns = ['price', 'volume']
+def _default_provider():
+    if PRICE_PROVIDER == "yahoo":
+        return YahooFinanceProvider()
+    if PRICE_PROVIDER == "files":
+        return FileProvider(PRICE_DATA_DIR)
+    if PRICE_PROVIDER == "synthetic":
+        return SyntheticProvider(seed=PRICE_SYNTHETIC_SEED)
+    raise ValueError(f"Unknown price provider: {PRICE_PROVIDER}")
 
-    df.dropna(inplace=True)
-    df['returns'] = df['price'].pct_change()
+_provider = _default_provider()
 
-    return df.dropna()
\ No newline at end of file
+def get_provider():
+    """Return the provider used when fetch_price_data is not given one"""
+    return _provider
+
+def set_provider(provider):
+    """Replace the default price provider, e.g. with a SyntheticProvider for benchmarks"""
+    global _provider
+    _provider = provider
+    price_cache.clear()
+
+def set_price_store(store):
+    """Replace the persistent price store, or disable it with None"""
+    global price_store
+    price_store = store
+    price_cache.clear()
+
+def _load_raw(ticker, start, end, use_cache, provider):
+    """Raw price/volume rows from the memory cache, then the price store, then the provider"""
+    if not (use_cache and provider.cacheable):
+        return provider.fetch(ticker, start, end)
+
+    start, end = to_timestamp(start), to_timestamp(end)
+    if price_store is not None and not price_store.memory_cached:
+        return price_store.read_through(ticker, start, end, provider.fetch)
+
+    df = price_cache.get(ticker, start, end)
+    if df is None:
+        if price_store is not None:
+            df = price_store.read_through(ticker, start, end, provider.fetch)
+        else:
+            df = provider.fetch(ticker, start, end)
+        # Failed downloads come back empty and must not be served from memory
+        if not df.empty:
+            price_cache.put(ticker, df, start, end)
+    return df
+
+def fetch_price_data(ticker, start, end, use_cache=True, provider=None):
+    """Fetch prices, volumes and returns, reading through the local price cache"""
+    provider = provider or _provider
+    df = _load_raw(ticker, start, end, use_cache, provider)
+
+    df = df.dropna()
+    df = df.assign(returns=df['price'].pct_change())
+
+    # Usually only the first return is missing; slicing it off instead of
+    # dropna() keeps the columns as views of memory-mapped stores
+    if df['returns'].iloc[1:].isna().any():
+        return df.dropna()
+    return df.iloc[1:]
+
+def fetch_price_panel(tickers, start, end, how='outer', use_cache=True, provider=None):
+    """
+    Fetch many tickers with one batched provider call and align them on a
+    shared date index. Returns a PricePanel of (dates x tickers) arrays.
+    """
+    provider = provider or _provider
+    tickers = list(dict.fromkeys(tickers))
+
+    if not (use_cache and provider.cacheable):
+        frames = provider.fetch_many(tickers, start, end)
+        return PricePanel.from_frames(frames, tickers, how=how)
+
+    start, end = to_timestamp(start), to_timestamp(end)
+    if price_store is not None and not price_store.memory_cached:
+        frames = price_store.read_through_many(tickers, start, end, provider.fetch_many)
+        return PricePanel.from_frames(frames, tickers, how=how)
+
+    frames = {ticker: price_cache.get(ticker, start, end) for ticker in tickers}
+    missing = [ticker for ticker, df in frames.items() if df is None]
+
+    if missing:
+        if price_store is not None:
+            fetched = price_store.read_through_many(missing, start, end, provider.fetch_many)
+        else:
+            fetched = provider.fetch_many(missing, start, end)
+        for ticker, df in fetched.items():
+            if not df.empty:
+                price_cache.put(ticker, df, start, end)
+            frames[ticker] = df
+
+    return PricePanel.from_frames(frames, tickers, how=how)
@@ -0,0 +1,44 @@
+"""
+Content hashes for memoizing backtest results.
+
+A result key hashes everything a backtest result depends on: ticker, date
+range, strategy, its parameters and a fingerprint of the price data it ran
+on. Identical requests map to the same key, and any change to the prices
+(a revised bar, a newly available day) produces a new one.
+"""
+import hashlib
+import inspect
+import json
+
+import numpy as np
+import pandas as pd
+
+# Bump when the backtest or metric calculations change, so older results stop matching
+RESULT_CACHE_VERSION = 1
+
+
+def data_fingerprint(df):
+    """SHA-256 of the dates, prices and volumes of a fetch_price_data frame"""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(pd.DatetimeIndex(df.index).as_unit('ns').asi8).tobytes())
+    for column in ('price', 'volume'):
+        if column in df:
+            digest.update(np.ascontiguousarray(df[column].to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+def default_params(fn):
+    """Keyword defaults of a signal function, excluding the price and engine arguments"""
+    return {
+        name: p.default for name, p in inspect.signature(fn).parameters.items()
+        if p.default is not inspect.Parameter.empty and name not in ('indicators', 'cache')
+    }
+
+
+def result_key(ticker, start, end, strategy, params, fingerprint):
+    """SHA-256 hex key of one backtest's inputs"""
+    payload = json.dumps(
+        [RESULT_CACHE_VERSION, ticker.upper(), str(start), str(end), strategy, params or {}, fingerprint],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
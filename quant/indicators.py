@@ -0,0 +1,131 @@
+"""
+Memoized technical indicators shared between strategies.
+
+Indicators are registered as named nodes that compute their value from input
+series and from other nodes through an IndicatorCache. The cache memoizes
+each node under (series, indicator, params), so a 20-bar moving average used
+by both the moving average and Bollinger strategies, or the EMAs behind
+MACD, are computed once per dataset.
+"""
+import numpy as np
+import pandas as pd
+
+INDICATORS = {}
+
+
+def indicator(name):
+    """Register fn(cache, source, *params) as the indicator node `name`"""
+    def register(fn):
+        INDICATORS[name] = fn
+        return fn
+    return register
+
+
+class IndicatorCache:
+    """
+    Memoized indicator values over named 1-D input series.
+
+        cache = IndicatorCache(price=prices)
+        cache.get('sma', 20)                  # rolling mean of 'price'
+        cache.get('ema', 12, source='price')
+    """
+
+    def __init__(self, **series):
+        self.series = {name: np.asarray(values, dtype=np.float64) for name, values in series.items()}
+        self._values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def source(self, name):
+        if name not in self.series:
+            raise ValueError(f"Unknown input series: {name}")
+        return self.series[name]
+
+    def get(self, name, *params, source='price'):
+        key = (source, name, params)
+        if key in self._values:
+            self.hits += 1
+            return self._values[key]
+
+        if name not in INDICATORS:
+            raise ValueError(f"Unknown indicator: {name}")
+
+        self.misses += 1
+        value = INDICATORS[name](self, source, *params)
+        self._values[key] = value
+        return value
+
+
+# Array primitives. Rolling and exponential means go through pandas' compiled
+# window kernels on a zero-copy Series so values match the DataFrame code exactly.
+
+def _series(values):
+    return pd.Series(values, copy=False)
+
+
+def rolling_mean(values, window):
+    return _series(values).rolling(window).mean().to_numpy()
+
+
+def rolling_std(values, window):
+    return _series(values).rolling(window).std().to_numpy()
+
+
+def ema(values, span):
+    return _series(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+# Indicator nodes
+
+@indicator('sma')
+def _sma(cache, source, window):
+    return rolling_mean(cache.source(source), window)
+
+
+@indicator('std')
+def _std(cache, source, window):
+    return rolling_std(cache.source(source), window)
+
+
+@indicator('ema')
+def _ema(cache, source, span):
+    return ema(cache.source(source), span)
+
+
+@indicator('diff')
+def _diff(cache, source):
+    values = cache.source(source)
+    delta = np.empty_like(values)
+    delta[:1] = np.nan
+    delta[1:] = np.diff(values)
+    return delta
+
+
+@indicator('avg_gain')
+def _avg_gain(cache, source, window):
+    delta = cache.get('diff', source=source)
+    return rolling_mean(np.where(delta > 0, delta, 0.0), window)
+
+
+@indicator('avg_loss')
+def _avg_loss(cache, source, window):
+    delta = cache.get('diff', source=source)
+    return rolling_mean(np.where(delta < 0, -delta, 0.0), window)
+
+
+@indicator('rsi')
+def _rsi(cache, source, window):
+    gain = cache.get('avg_gain', window, source=source)
+    loss = cache.get('avg_loss', window, source=source)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + gain / loss))
+
+
+@indicator('macd')
+def _macd(cache, source, fast, slow):
+    return cache.get('ema', fast, source=source) - cache.get('ema', slow, source=source)
+
+
+@indicator('macd_signal')
+def _macd_signal(cache, source, fast, slow, signal_window):
+    return ema(cache.get('macd', fast, slow, source=source), signal_window)
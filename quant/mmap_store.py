@@ -0,0 +1,161 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from quant.store import PriceStore, empty_frame, merge_frames, write_atomic
+
+COLUMNS = ('dates', 'price', 'volume')
+DTYPES = {'dates': np.int64, 'price': np.float64, 'volume': np.float64}
+
+# Age after which a version directory that is not live is treated as abandoned
+ORPHAN_SECONDS = 300
+
+
+class MmapPriceStore(PriceStore):
+    """
+    Price store keeping each ticker as fixed-dtype .npy arrays opened with
+    np.load(mmap_mode='r').
+
+    Layout: <directory>/<TICKER>/current.json names the live version, its
+    directory and its coverage, and that directory (v<N>-<random>, or v<N>
+    for stores written before directories were uniquely named) holds dates.npy (int64 ns
+    timestamps, sorted), price.npy and volume.npy (float64). The sorted dates
+    array is the date-to-offset index: a range lookup is two searchsorted
+    calls that only touch a few pages. Reads return views into the mapping,
+    so worker processes share the data through the OS page cache.
+
+    A write builds a new, uniquely named version directory and then swaps
+    current.json, so readers holding the old mapping are never disturbed
+    and concurrent writers in other processes never write into the same
+    files; the last swap wins.
+    """
+
+    # The OS page cache already keeps hot tickers in memory
+    memory_cached = False
+
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+        self._maps = {}
+        self._maps_lock = threading.Lock()
+
+    def _ticker_dir(self, ticker):
+        return os.path.join(self.directory, ticker.upper())
+
+    def _version_dir(self, ticker, current):
+        return os.path.join(self._ticker_dir(ticker), current.get('dir', f"v{current['version']}"))
+
+    def _current(self, ticker):
+        path = os.path.join(self._ticker_dir(ticker), "current.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def coverage(self, ticker):
+        current = self._current(ticker)
+        if current is None:
+            return None
+        return pd.Timestamp(current['start']), pd.Timestamp(current['end'])
+
+    def _arrays(self, ticker, attempts=5):
+        """Memory-mapped arrays of the live version, opened once per version"""
+        for attempt in range(attempts):
+            current = self._current(ticker)
+            if current is None:
+                return None
+
+            version_dir = self._version_dir(ticker, current)
+            key = (ticker.upper(), version_dir)
+            with self._maps_lock:
+                arrays = self._maps.get(key)
+                if arrays is not None:
+                    return arrays
+                try:
+                    arrays = {
+                        name: np.load(os.path.join(version_dir, name + ".npy"), mmap_mode='r')
+                        for name in COLUMNS
+                    }
+                except FileNotFoundError:
+                    # Another process swapped in a newer version and removed this one
+                    if attempt == attempts - 1:
+                        raise
+                    continue
+                # Drop mappings of versions that have been replaced
+                for old in [k for k in self._maps if k[0] == key[0]]:
+                    del self._maps[old]
+                self._maps[key] = arrays
+                return arrays
+
+    def view(self, ticker, start, end):
+        """Zero-copy (dates, price, volume) views of the rows in [start, end)"""
+        arrays = self._arrays(ticker)
+        if arrays is None:
+            empty = np.empty(0)
+            return empty.astype(np.int64).view('datetime64[ns]'), empty, empty
+
+        dates = arrays['dates']
+        lo, hi = np.searchsorted(dates, [pd.Timestamp(start).value, pd.Timestamp(end).value])
+        return dates[lo:hi].view('datetime64[ns]'), arrays['price'][lo:hi], arrays['volume'][lo:hi]
+
+    def read(self, ticker, start, end):
+        dates, price, volume = self.view(ticker, start, end)
+        if len(dates) == 0:
+            return empty_frame()
+
+        index = pd.DatetimeIndex(dates, name='Date', copy=False)
+        return pd.DataFrame({'price': price, 'volume': volume}, index=index, copy=False)
+
+    def _load(self, ticker):
+        arrays = self._arrays(ticker)
+        if arrays is None:
+            return None
+        return self.read(ticker, pd.Timestamp.min, pd.Timestamp.max)
+
+    def write(self, ticker, df, coverage):
+        ticker_dir = self._ticker_dir(ticker)
+        os.makedirs(ticker_dir, exist_ok=True)
+
+        current = self._current(ticker)
+        version = current['version'] + 1 if current else 1
+
+        merged = merge_frames(self._load(ticker), df[['price', 'volume']])
+        columns = {
+            'dates': merged.index.as_unit('ns').asi8,
+            'price': merged['price'].to_numpy(),
+            'volume': merged['volume'].to_numpy(),
+        }
+
+        version_dir = tempfile.mkdtemp(dir=ticker_dir, prefix=f"v{version}-")
+        for name in COLUMNS:
+            np.save(os.path.join(version_dir, name + ".npy"), np.ascontiguousarray(columns[name], dtype=DTYPES[name]))
+
+        def write_current(path):
+            with open(path, "w") as f:
+                json.dump({
+                    'version': version,
+                    'dir': os.path.basename(version_dir),
+                    'start': coverage[0].isoformat(),
+                    'end': coverage[1].isoformat(),
+                }, f)
+
+        write_atomic(os.path.join(ticker_dir, "current.json"), write_current)
+
+        if current is not None:
+            # Open mappings stay valid on POSIX; elsewhere the old files are left behind
+            shutil.rmtree(self._version_dir(ticker, current), ignore_errors=True)
+
+        # Versions of writers that lost a race to another process are never swapped in; remove
+        # them once they are too old to still be in the middle of being written
+        live = self._current(ticker)
+        keep = {version_dir, self._version_dir(ticker, live) if live else version_dir}
+        cutoff = time.time() - ORPHAN_SECONDS
+        for entry in os.scandir(ticker_dir):
+            if entry.is_dir() and entry.path not in keep and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+
+class PricePanel:
+    """
+    Prices, returns and volumes for many tickers aligned on one date index.
+
+    prices, returns and volumes are C-contiguous float64 arrays of shape
+    (len(index), len(tickers)). Dates on which a ticker did not trade are NaN,
+    and so is the return on the first row and right after any gap.
+    """
+
+    def __init__(self, index, tickers, prices, volumes, returns=None):
+        self.index = index
+        self.tickers = list(tickers)
+        self.prices = np.ascontiguousarray(prices, dtype=np.float64)
+        self.volumes = np.ascontiguousarray(volumes, dtype=np.float64)
+
+        if returns is not None:
+            # Already computed (e.g. a shared memory view); contiguous float64 input is not copied
+            self.returns = np.ascontiguousarray(returns, dtype=np.float64)
+        else:
+            self.returns = np.full_like(self.prices, np.nan)
+            self.returns[1:] = self.prices[1:] / self.prices[:-1] - 1
+
+        self._columns = {ticker: i for i, ticker in enumerate(self.tickers)}
+
+    @classmethod
+    def from_frames(cls, frames, tickers=None, how='outer'):
+        """
+        Build a panel from {ticker: DataFrame} with 'price' and 'volume'
+        columns. how='outer' keeps every date any ticker traded on,
+        how='inner' keeps only the dates all tickers share.
+        """
+        tickers = list(tickers if tickers is not None else frames)
+        prices = pd.concat({t: frames[t]['price'] for t in tickers}, axis=1, join=how).sort_index()
+        volumes = pd.concat({t: frames[t]['volume'] for t in tickers}, axis=1).reindex(prices.index)
+
+        return cls(prices.index, tickers, prices.to_numpy(), volumes.to_numpy())
+
+    def __len__(self):
+        return len(self.index)
+
+    def column(self, ticker):
+        """Column position of a ticker in the panel arrays"""
+        if ticker not in self._columns:
+            raise ValueError(f"{ticker} is not in the panel")
+        return self._columns[ticker]
+
+    def frame(self, ticker):
+        """
+        Return one ticker's data in the fetch_price_data layout: the dates it
+        traded on, with 'price', 'volume' and 'returns' columns.
+        """
+        j = self.column(ticker)
+        traded = ~np.isnan(self.prices[:, j])
+
+        df = pd.DataFrame({
+            'price': self.prices[traded, j],
+            'volume': self.volumes[traded, j],
+        }, index=self.index[traded])
+        df['returns'] = df['price'].pct_change()
+
+        return df.dropna()
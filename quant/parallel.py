@@ -0,0 +1,164 @@
+"""
+Process-pool backtest runner.
+
+Tasks are (ticker, strategy) or (ticker, strategy, params) tuples, where
+params are keyword arguments for the strategy's signal function. Tasks are
+grouped by ticker so a worker loads each ticker's prices and indicators once
+and backtests all of its strategies in one batched kernel call, and tickers
+are shipped to the workers in chunks to keep inter-process overhead low.
+Workers send back small metric dicts, never price frames.
+
+Given a PricePanel, the runner places it in shared memory and workers attach
+to it once at startup instead of loading prices themselves, so only task
+descriptors and results cross process boundaries.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from quant.backtest import backtest_matrix
+from quant.config import BACKTEST_WORKERS
+from quant.data import fetch_price_data
+from quant.indicators import IndicatorCache
+from quant.risk import performance_metrics
+from quant.shared_panel import SharedPanel, attach_panel
+from quant.signals import STRATEGIES
+
+METRICS = ('sharpe', 'max_drawdown', 'final_equity', 'total_return', 'win_rate', 'num_trades',
+           'var', 'expected_shortfall')
+
+# The panel a worker process attached to in _init_worker, with its shared memory handle
+_worker_panel = None
+_worker_shm = None
+
+
+def _init_worker(descriptor):
+    global _worker_panel, _worker_shm
+    _worker_panel, _worker_shm = attach_panel(descriptor)
+
+
+def expand_tasks(tickers, strategies=None):
+    """Every (ticker, strategy) pair, for all registered strategies by default"""
+    strategies = list(STRATEGIES) if strategies is None else list(strategies)
+    return [(ticker, strategy) for ticker in tickers for strategy in strategies]
+
+
+def _normalize(task):
+    ticker, strategy, *rest = task
+    params = dict(rest[0]) if rest and rest[0] else {}
+    return ticker, strategy, params
+
+
+def _failure(ticker, strategy, params, error):
+    result = {'ticker': ticker, 'strategy': strategy, 'params': params}
+    result.update(dict.fromkeys(METRICS))
+    result['error'] = f"{type(error).__name__}: {error}"
+    return result
+
+
+def _run_ticker(ticker, jobs, start, end, provider, panel):
+    """Backtest one ticker's jobs [(index, strategy, params)] -> [(index, result)]"""
+    try:
+        if panel is not None:
+            df = panel.frame(ticker)
+        else:
+            df = fetch_price_data(ticker, start, end, provider=provider)
+        if df.empty:
+            raise ValueError(f"No price data for {ticker}")
+    except Exception as e:
+        return [(index, _failure(ticker, strategy, params, e)) for index, strategy, params in jobs]
+
+    price = df['price'].to_numpy()
+    cache = IndicatorCache(price=price)
+
+    output = []
+    ok, signals = [], []
+    for index, strategy, params in jobs:
+        try:
+            if strategy not in STRATEGIES:
+                raise ValueError(f"Unknown strategy: {strategy}")
+            signals.append(STRATEGIES[strategy](price, cache=cache, **params))
+            ok.append((index, strategy, params))
+        except Exception as e:
+            output.append((index, _failure(ticker, strategy, params, e)))
+
+    if ok:
+        equity, strat_returns = backtest_matrix(df['returns'].to_numpy(), np.column_stack(signals))
+        metrics = performance_metrics(equity, strat_returns)
+
+        for k, (index, strategy, params) in enumerate(ok):
+            result = {'ticker': ticker, 'strategy': strategy, 'params': params}
+            result.update({name: metrics[name][k].item() for name in METRICS})
+            result['error'] = None
+            output.append((index, result))
+
+    return output
+
+
+def _run_chunk(chunk, start, end, provider, panel=None):
+    panel = panel if panel is not None else _worker_panel
+    return [pair for ticker, jobs in chunk for pair in _run_ticker(ticker, jobs, start, end, provider, panel)]
+
+
+def run_backtests(tasks, start, end, max_workers=None, chunksize=None, provider=None, panel=None):
+    """
+    Run backtest tasks across a process pool.
+
+    Returns one dict per task, in task order, with ticker, strategy, params,
+    the METRICS values (max_drawdown as a fraction) and error, which is None
+    on success or a message when that task failed. A failure only affects the
+    tasks it hit: a bad strategy fails its own task, a ticker without data
+    fails that ticker's tasks and a crashed worker fails its chunk.
+
+    max_workers defaults to BACKTEST_WORKERS (or the CPU count); chunksize is
+    the number of tickers per submission and defaults to about four chunks
+    per worker. With one worker the tasks run in this process.
+
+    Pass a PricePanel (e.g. from fetch_price_panel) as `panel` to backtest
+    its data instead of fetching each ticker between start and end; tickers
+    missing from the panel fail their tasks.
+    """
+    tasks = [_normalize(task) for task in tasks]
+
+    by_ticker = {}
+    for index, (ticker, strategy, params) in enumerate(tasks):
+        by_ticker.setdefault(ticker, []).append((index, strategy, params))
+    groups = list(by_ticker.items())
+
+    workers = max_workers or BACKTEST_WORKERS or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(groups) // (workers * 4))
+    chunks = [groups[i:i + chunksize] for i in range(0, len(groups), chunksize)]
+
+    results = [None] * len(tasks)
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            for index, result in _run_chunk(chunk, start, end, provider, panel):
+                results[index] = result
+        return results
+
+    shared = SharedPanel(panel) if panel is not None else None
+    pool_options = {'initializer': _init_worker, 'initargs': (shared.descriptor,)} if shared else {}
+
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), **pool_options) as pool:
+            futures = {pool.submit(_run_chunk, chunk, start, end, provider): chunk for chunk in chunks}
+
+            for future in as_completed(futures):
+                try:
+                    pairs = future.result()
+                except Exception as e:
+                    # The worker died or its results could not be sent back
+                    pairs = [
+                        (index, _failure(ticker, strategy, params, e))
+                        for ticker, jobs in futures[future]
+                        for index, strategy, params in jobs
+                    ]
+                for index, result in pairs:
+                    results[index] = result
+    finally:
+        if shared is not None:
+            shared.unlink()
+
+    return results
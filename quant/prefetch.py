@@ -0,0 +1,49 @@
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from quant.data import fetch_price_data
+
+
+async def prefetch_universe(tickers, start, end, concurrency=8, retries=3, backoff=0.5, provider=None):
+    """
+    Warm the price caches for a universe of tickers concurrently.
+
+    At most `concurrency` downloads run at once. A failed or empty download is
+    retried up to `retries` times with jittered exponential backoff starting at
+    `backoff` seconds. Returns {ticker: number of bars} for successes and
+    {ticker: exception} for tickers that still failed, so one bad symbol does
+    not abort the refresh.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return {}
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    def load(ticker):
+        df = fetch_price_data(ticker, start, end, provider=provider)
+        if df.empty:
+            raise ValueError(f"No price data returned for {ticker}")
+        return len(df)
+
+    async def prefetch_one(pool, ticker):
+        async with semaphore:
+            for attempt in range(retries + 1):
+                try:
+                    return ticker, await loop.run_in_executor(pool, load, ticker)
+                except Exception as e:
+                    if attempt == retries:
+                        return ticker, e
+                    await asyncio.sleep(backoff * 2 ** attempt * (1 + random.random()))
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(tickers))) as pool:
+        results = await asyncio.gather(*(prefetch_one(pool, ticker) for ticker in tickers))
+
+    return dict(results)
+
+
+def prefetch(tickers, start, end, **kwargs):
+    """Blocking wrapper around prefetch_universe for scripts"""
+    return asyncio.run(prefetch_universe(tickers, start, end, **kwargs))
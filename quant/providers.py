@@ -0,0 +1,195 @@
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from quant.store import empty_frame
+
+
+def _slice(df, start, end):
+    """Keep rows in [start, end)"""
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    return df[(df.index >= start) & (df.index < end)]
+
+
+class PriceProvider:
+    """
+    Base class for price sources.
+
+    fetch() returns a DataFrame indexed by date with raw 'price' and 'volume'
+    columns for [start, end). Providers that are slow or remote set
+    cacheable = True so fetch_price_data puts the price store in front of them.
+    """
+
+    cacheable = False
+
+    def fetch(self, ticker, start, end):
+        raise NotImplementedError
+
+    def fetch_many(self, tickers, start, end, max_workers=8):
+        """Fetch several tickers concurrently and return a {ticker: DataFrame} dict"""
+        tickers = list(tickers)
+        if len(tickers) <= 1:
+            return {ticker: self.fetch(ticker, start, end) for ticker in tickers}
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as pool:
+            frames = pool.map(lambda ticker: self.fetch(ticker, start, end), tickers)
+            return dict(zip(tickers, frames))
+
+
+class YahooFinanceProvider(PriceProvider):
+    """Downloads adjusted daily prices from Yahoo Finance"""
+
+    cacheable = True
+
+    def fetch(self, ticker, start, end):
+        df = yf.download(ticker, start=start, end=end, auto_adjust=True)
+
+        if 'Adj Close' in df.columns:
+            price_col = 'Adj Close'
+        elif 'Close' in df.columns:
+            price_col = 'Close'
+        else:
+            raise ValueError(f"No price column found for {ticker}")
+
+        df = df[[price_col, 'Volume']].copy()
+        df.columns = ['price', 'volume']
+
+        return df.dropna()
+
+    def fetch_many(self, tickers, start, end, max_workers=8):
+        """Download all tickers in one batched yf.download call"""
+        tickers = list(tickers)
+        if len(tickers) <= 1:
+            return super().fetch_many(tickers, start, end)
+
+        raw = yf.download(tickers, start=start, end=end, auto_adjust=True, group_by='column', threads=max_workers)
+        fields = raw.columns.get_level_values(0) if not raw.empty else []
+        price_col = 'Adj Close' if 'Adj Close' in fields else 'Close'
+
+        frames = {}
+        for ticker in tickers:
+            if price_col not in fields or ticker not in raw[price_col].columns:
+                frames[ticker] = empty_frame()
+                continue
+            df = pd.DataFrame({'price': raw[price_col][ticker], 'volume': raw['Volume'][ticker]})
+            frames[ticker] = df.dropna()
+        return frames
+
+
+class FileProvider(PriceProvider):
+    """
+    Reads prices from a local directory holding one <TICKER>.parquet or
+    <TICKER>.csv file per ticker. Files need a date index (or a 'Date'/'date'
+    column), a price column ('price', 'Adj Close' or 'Close') and optionally
+    a volume column.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _read(self, ticker):
+        base = os.path.join(self.directory, ticker.upper())
+        if os.path.exists(base + ".parquet"):
+            df = pd.read_parquet(base + ".parquet")
+        elif os.path.exists(base + ".csv"):
+            df = pd.read_csv(base + ".csv")
+        else:
+            raise ValueError(f"No price file found for {ticker} in {self.directory}")
+
+        for date_col in ('Date', 'date', 'Datetime', 'datetime'):
+            if date_col in df.columns:
+                df = df.set_index(date_col)
+                break
+        df.index = pd.to_datetime(df.index)
+        return df
+
+    def fetch(self, ticker, start, end):
+        df = self._read(ticker)
+
+        for price_col in ('price', 'Adj Close', 'Close', 'close'):
+            if price_col in df.columns:
+                break
+        else:
+            raise ValueError(f"No price column found for {ticker}")
+
+        volume_col = next((c for c in ('volume', 'Volume') if c in df.columns), None)
+        volume = df[volume_col] if volume_col else 0.0
+
+        df = pd.DataFrame({'price': df[price_col], 'volume': volume}, index=df.index)
+        return _slice(df.sort_index(), start, end).dropna()
+
+
+class SyntheticProvider(PriceProvider):
+    """
+    Generates seeded geometric Brownian motion prices with optional Merton
+    style jumps. The same (seed, ticker, start, end) always gives the same
+    path, so benchmarks are reproducible without any network access.
+
+    mu and sigma are annualized; jump_intensity is the expected number of
+    jumps per year and jump_mean/jump_std describe the log jump size.
+    """
+
+    def __init__(self, seed=0, mu=0.08, sigma=0.2, jump_intensity=0.0,
+                 jump_mean=0.0, jump_std=0.0, freq='B', periods_per_year=252,
+                 initial_price=100.0):
+        self.seed = seed
+        self.mu = mu
+        self.sigma = sigma
+        self.jump_intensity = jump_intensity
+        self.jump_mean = jump_mean
+        self.jump_std = jump_std
+        self.freq = freq
+        self.periods_per_year = periods_per_year
+        self.initial_price = initial_price
+
+    def _rng(self, ticker):
+        return np.random.default_rng([self.seed, zlib.crc32(ticker.upper().encode())])
+
+    def _path(self, rng, n):
+        dt = 1.0 / self.periods_per_year
+        # Compensate the drift so jumps do not change the expected return
+        jump_comp = self.jump_intensity * (np.exp(self.jump_mean + 0.5 * self.jump_std ** 2) - 1)
+        drift = (self.mu - 0.5 * self.sigma ** 2 - jump_comp) * dt
+
+        log_returns = drift + self.sigma * np.sqrt(dt) * rng.standard_normal(n)
+        if self.jump_intensity > 0:
+            jumps = rng.poisson(self.jump_intensity * dt, n)
+            log_returns += jumps * self.jump_mean + np.sqrt(jumps) * self.jump_std * rng.standard_normal(n)
+
+        price = self.initial_price * np.exp(np.cumsum(log_returns))
+        volume = np.floor(rng.lognormal(mean=13.0, sigma=0.5, size=n))
+        return price, volume
+
+    def _index(self, start, end=None, periods=None):
+        start = pd.Timestamp(start)
+        if self.freq != 'B':
+            if periods is None:
+                return pd.date_range(start, pd.Timestamp(end), freq=self.freq, inclusive='left')
+            return pd.date_range(start, periods=periods, freq=self.freq)
+
+        # pandas builds business-day ranges in a Python loop, numpy does it in one pass
+        first = start.to_datetime64().astype('datetime64[D]')
+        last = pd.Timestamp(end).to_datetime64().astype('datetime64[D]') if periods is None \
+            else first + np.timedelta64(periods * 7 // 5 + 7, 'D')
+        days = np.arange(first, last, dtype='datetime64[D]')
+        days = days[np.is_busday(days)]
+        return pd.DatetimeIndex(days[:periods] if periods is not None else days)
+
+    def fetch(self, ticker, start, end):
+        index = self._index(start, end=end)
+        price, volume = self._path(self._rng(ticker), len(index))
+        return pd.DataFrame({'price': price, 'volume': volume}, index=index)
+
+    def generate(self, ticker, n_bars, start='2000-01-03'):
+        """
+        Generate exactly n_bars bars starting at start. Use an intraday freq
+        such as 'min' (with a matching periods_per_year) for multi-million bar
+        histories.
+        """
+        index = self._index(start, periods=n_bars)
+        price, volume = self._path(self._rng(ticker), n_bars)
+        return pd.DataFrame({'price': price, 'volume': volume}, index=index)
@@ -28,4 +28,95 @@ def compute_metrics(equity_curve, strategy_returns):
 
     num_trades = (strategy_returns != 0).sum()
 
-    return final_equity, total_return, win_rate, num_trades
\ No newline at end of file
+    return final_equity, total_return, win_rate, num_trades
+
+def _percentile_sorted(part, lo, t):
+    """Linear interpolation between order statistics lo and lo + 1, as np.percentile does it"""
+    below = part[lo]
+    if t == 0:
+        return below.copy()
+    above = part[lo + 1]
+    diff = above - below
+    # Same formula as numpy's _lerp, so results match np.percentile bit for bit
+    return np.where(t >= 0.5, above - diff * (1 - t), below + diff * t)
+
+def performance_metrics(equity_curve, strategy_returns, alpha=0.05, rf=0, periods_per_year=252):
+    """
+    Compute final_equity, total_return, sharpe, max_drawdown, var,
+    expected_shortfall, win_rate and num_trades together.
+
+    Takes Series or arrays; 2-D input is (bars x strategies) and gives one
+    value per column, 1-D input gives scalars. Missing values are skipped like
+    pandas does (including for VaR and ES), except that win_rate and
+    num_trades count them as trades like compute_metrics. Pass alpha=None
+    to skip VaR and ES, which need a partial sort.
+    """
+    equity = np.asarray(equity_curve, dtype=np.float64)
+    returns = np.asarray(strategy_returns, dtype=np.float64)
+    single = returns.ndim == 1
+    if single:
+        equity, returns = equity[:, None], returns[:, None]
+
+    # A leading all-missing row (the first bar of a backtest) needs no special handling below
+    missing = np.isnan(returns)
+    skip = 1 if len(returns) and missing[0].all() else 0
+    body, curve = returns[skip:], equity[skip:]
+    gaps = missing[skip:].any() or np.isnan(curve).any()
+
+    final_equity = equity[-1] if len(equity) else np.full(returns.shape[1], np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if gaps:
+            mean, std = np.nanmean(body, axis=0), np.nanstd(body, axis=0, ddof=1)
+            peak = np.fmax.accumulate(curve, axis=0)
+        else:
+            mean, std = body.mean(axis=0), body.std(axis=0, ddof=1)
+            peak = np.maximum.accumulate(curve, axis=0)
+        sharpe = (mean - rf) / std * np.sqrt(periods_per_year)
+
+        drawdown = np.subtract(peak, curve)
+        drawdown /= peak
+        max_dd = (np.nanmax if gaps else np.max)(drawdown, axis=0) if len(curve) else np.full_like(sharpe, np.nan)
+
+    # One partition gives the VaR order statistics and the ES tail together
+    if alpha is None:
+        var = es = None
+    elif gaps:
+        var = np.nanpercentile(body, 100 * alpha, axis=0) if len(body) else np.full_like(sharpe, np.nan)
+        tail = body <= var
+        es = np.where(tail, body, 0.0).sum(axis=0) / tail.sum(axis=0)
+    elif len(body):
+        position = (len(body) - 1) * alpha
+        lo = int(position)
+        t = position - lo
+        # Partition each strategy's returns as a contiguous row
+        part = np.array(body.T, order='C')
+        part.partition([lo, lo + 1] if lo + 1 < len(body) else lo, axis=1)
+        part = part.T
+        var = _percentile_sorted(part, lo, t)
+        # Values tied with the VaR can sit above position lo after partitioning
+        ties = part[lo + 1:] <= var
+        es = (part[:lo + 1].sum(axis=0) + np.where(ties, part[lo + 1:], 0.0).sum(axis=0)) / (lo + 1 + ties.sum(axis=0))
+    else:
+        var = es = np.full_like(sharpe, np.nan)
+
+    winning = (returns > 0).sum(axis=0)
+    trades = (returns != 0).sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        win_rate = np.where(trades > 0, winning / trades * 100, 0.0)
+
+    metrics = {
+        'final_equity': final_equity,
+        'total_return': (final_equity - 1) * 100,
+        'sharpe': sharpe,
+        'max_drawdown': max_dd,
+        'var': var,
+        'expected_shortfall': es,
+        'win_rate': win_rate,
+        'num_trades': trades,
+    }
+    if alpha is None:
+        del metrics['var'], metrics['expected_shortfall']
+    if single:
+        return {name: values[0] for name, values in metrics.items()}
+    return metrics
@@ -0,0 +1,210 @@
+"""
+Rolling-window risk analytics in O(n) or O(n log n) total.
+
+Every function returns float64 arrays aligned with its input, NaN until a
+window holds `window` valid values (or while it contains a missing one), so
+the results can be served next to the price dates as they are.
+
+Volatility and Sharpe come from running sums of the returns and their
+squares, drawdowns from running and sliding peaks, and historical VaR/ES
+from a Fenwick tree over the ranks of the return values, which answers the
+order statistic and tail sum of each window in O(log n) instead of
+re-sorting it.
+"""
+from bisect import bisect_right
+
+import numpy as np
+import pandas as pd
+
+
+def _window_sums(values, window):
+    """Trailing window sums from one zero-prefixed cumulative sum; NaN in warm-up"""
+    csum = np.empty(len(values) + 1)
+    csum[0] = 0.0
+    np.cumsum(values, out=csum[1:])
+    sums = np.full(len(values), np.nan)
+    sums[window - 1:] = csum[window:] - csum[:-window]
+    return sums
+
+
+def _rolling_moments(returns, window):
+    """Rolling mean and sample variance (ddof=1) over full windows of valid values"""
+    if window < 2:
+        raise ValueError("window must be at least 2")
+
+    returns = np.asarray(returns, dtype=np.float64)
+    valid = ~np.isnan(returns)
+
+    # Centering on the overall mean keeps the running sums of squares accurate
+    center = returns[valid].mean() if valid.any() else 0.0
+    centered = np.where(valid, returns - center, 0.0)
+
+    counts = _window_sums(valid.astype(np.float64), window)
+    sums = _window_sums(centered, window)
+    squares = _window_sums(centered * centered, window)
+
+    # Windows of one repeated value (flat strategy stretches) have zero variance;
+    # the running sums would leave rounding noise there, so find them exactly
+    changes = np.zeros(len(returns))
+    changes[1:] = returns[1:] != returns[:-1]
+    constant = _window_sums(changes, window - 1) == 0
+
+    full = counts == window
+    mean = np.where(full, sums / window + center, np.nan)
+    var = np.where(full, np.maximum(squares - sums * sums / window, 0.0) / (window - 1), np.nan)
+    var[full & constant] = 0.0
+    return mean, var
+
+
+def rolling_volatility(returns, window=63, periods_per_year=252):
+    """Annualized rolling standard deviation of returns"""
+    _, var = _rolling_moments(returns, window)
+    return np.sqrt(var * periods_per_year)
+
+
+def rolling_sharpe(returns, window=63, rf=0, periods_per_year=252):
+    """
+    Annualized rolling Sharpe ratio, as quant.risk.sharpe_ratio over each
+    window; NaN where the window has no variance.
+    """
+    mean, var = _rolling_moments(returns, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = (mean - rf) / np.sqrt(var) * np.sqrt(periods_per_year)
+    sharpe[~(var > 0)] = np.nan
+    return sharpe
+
+
+def drawdown(equity):
+    """Drawdown from the running peak of the equity curve, as a positive fraction"""
+    equity = np.asarray(equity, dtype=np.float64)
+    # fmax carries the peak across missing values
+    peak = np.fmax.accumulate(equity)
+    return (peak - equity) / peak
+
+
+def rolling_drawdown(equity, window=63):
+    """Drawdown from the highest equity of the trailing window"""
+    equity = np.asarray(equity, dtype=np.float64)
+    # pandas' rolling max keeps a monotonic deque, so this is O(n) for any window
+    peak = pd.Series(equity, copy=False).rolling(window).max().to_numpy()
+    return (peak - equity) / peak
+
+
+class _Fenwick:
+    """Counts and sums of the values currently in a window, indexed by value rank"""
+
+    def __init__(self, size):
+        self.size = size
+        self.counts = [0] * (size + 1)
+        self.sums = [0.0] * (size + 1)
+        self.top = 1 << max(size.bit_length() - 1, 0)
+
+    def add(self, rank, value, sign):
+        i = rank + 1
+        while i <= self.size:
+            self.counts[i] += sign
+            self.sums[i] += sign * value
+            i += i & -i
+
+    def prefix(self, rank):
+        """Count and sum of the values with rank < rank"""
+        count, total = 0, 0.0
+        i = rank
+        while i > 0:
+            count += self.counts[i]
+            total += self.sums[i]
+            i -= i & -i
+        return count, total
+
+    def kth(self, k):
+        """Rank of the k-th smallest value (0-based)"""
+        position = 0
+        step = self.top
+        while step:
+            nxt = position + step
+            if nxt <= self.size and self.counts[nxt] <= k:
+                position = nxt
+                k -= self.counts[nxt]
+            step >>= 1
+        return position
+
+
+def rolling_var_es(returns, window=63, alpha=0.05):
+    """
+    Rolling historical VaR and expected shortfall at level alpha.
+
+    VaR is the alpha percentile of each window with np.percentile's linear
+    interpolation, and ES the mean of the window's returns at or below it,
+    the same definitions as quant.risk.value_at_risk / expected_shortfall.
+    Returns (var, es).
+    """
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    if not 0 <= alpha <= 1:
+        raise ValueError("alpha must be between 0 and 1")
+
+    returns = np.asarray(returns, dtype=np.float64)
+    n = len(returns)
+    var = np.full(n, np.nan)
+    es = np.full(n, np.nan)
+
+    valid = ~np.isnan(returns)
+    levels = np.unique(returns[valid])
+    if len(levels) == 0:
+        return var, es
+
+    # The loop runs on plain Python lists; scalar NumPy calls would dominate it
+    ranks = np.searchsorted(levels, returns).tolist()
+    values = returns.tolist()
+    valid = valid.tolist()
+    levels = levels.tolist()
+
+    position = (window - 1) * alpha
+    lo = int(position)
+    t = position - lo
+    hi = min(lo + 1, window - 1)
+
+    tree = _Fenwick(len(levels))
+    in_window = 0
+    for i in range(n):
+        if valid[i]:
+            tree.add(ranks[i], values[i], 1)
+            in_window += 1
+        if i >= window and valid[i - window]:
+            tree.add(ranks[i - window], values[i - window], -1)
+            in_window -= 1
+        if i < window - 1 or in_window < window:
+            continue
+
+        below = levels[tree.kth(lo)]
+        above = levels[tree.kth(hi)]
+        diff = above - below
+        # numpy's _lerp, so values match np.percentile exactly
+        v = above - diff * (1 - t) if t >= 0.5 else below + diff * t
+
+        count, total = tree.prefix(bisect_right(levels, v))
+        var[i] = v
+        es[i] = total / count
+
+    return var, es
+
+
+def rolling_risk(returns, equity=None, window=63, alpha=0.05, rf=0, periods_per_year=252):
+    """
+    All rolling risk series for one return stream: sharpe, volatility,
+    drawdown (from the running peak), rolling_drawdown, var and
+    expected_shortfall. equity defaults to the compounded returns.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if equity is None:
+        equity = np.cumprod(1 + np.nan_to_num(returns))
+
+    var, es = rolling_var_es(returns, window, alpha)
+    return {
+        'sharpe': rolling_sharpe(returns, window, rf, periods_per_year),
+        'volatility': rolling_volatility(returns, window, periods_per_year),
+        'drawdown': drawdown(equity),
+        'rolling_drawdown': rolling_drawdown(equity, window),
+        'var': var,
+        'expected_shortfall': es,
+    }
@@ -0,0 +1,87 @@
+"""
+Price panels in shared memory for worker processes.
+
+SharedPanel copies a PricePanel's dates, prices, returns and volumes into one
+multiprocessing.shared_memory block. Its descriptor is a small picklable
+tuple; worker processes pass it to attach_panel() to get a PricePanel whose
+arrays are read-only NumPy views of the shared block, so no price data is
+pickled or copied per worker.
+"""
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from quant.panel import PricePanel
+
+# Everything a worker needs to map the block: its name, array shape and column labels
+PanelDescriptor = namedtuple('PanelDescriptor', ['name', 'n_bars', 'tickers'])
+
+
+def _layout(buffer, n_bars, n_tickers):
+    """Dates (int64 ns) followed by the prices, returns and volumes matrices"""
+    cells = n_bars * n_tickers
+    dates = np.ndarray((n_bars,), dtype=np.int64, buffer=buffer)
+    offset = dates.nbytes
+    matrices = []
+    for _ in range(3):
+        matrices.append(np.ndarray((n_bars, n_tickers), dtype=np.float64, buffer=buffer, offset=offset))
+        offset += cells * 8
+    return dates, *matrices
+
+
+def _size(n_bars, n_tickers):
+    # SharedMemory rejects a zero size
+    return max(1, n_bars * 8 * (1 + 3 * n_tickers))
+
+
+class SharedPanel:
+    """
+    Owner of a shared memory copy of a PricePanel.
+
+        with SharedPanel(panel) as shared:
+            pool = ProcessPoolExecutor(initializer=init, initargs=(shared.descriptor,))
+
+    The block is unlinked when the context exits (or on unlink()); workers
+    must be done with it by then.
+    """
+
+    def __init__(self, panel):
+        n_bars, n_tickers = len(panel.index), len(panel.tickers)
+        self._shm = shared_memory.SharedMemory(create=True, size=_size(n_bars, n_tickers))
+        self.descriptor = PanelDescriptor(self._shm.name, n_bars, tuple(panel.tickers))
+
+        dates, prices, returns, volumes = _layout(self._shm.buf, n_bars, n_tickers)
+        dates[:] = pd.DatetimeIndex(panel.index).as_unit('ns').asi8
+        prices[:] = panel.prices
+        returns[:] = panel.returns
+        volumes[:] = panel.volumes
+        del dates, prices, returns, volumes
+
+    def unlink(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.unlink()
+
+
+def attach_panel(descriptor):
+    """
+    Map a SharedPanel into this process. Returns (panel, handle); keep the
+    handle referenced for as long as the panel's arrays are in use.
+    """
+    shm = shared_memory.SharedMemory(name=descriptor.name)
+    dates, prices, returns, volumes = _layout(shm.buf, descriptor.n_bars, len(descriptor.tickers))
+    for values in (prices, returns, volumes):
+        values.flags.writeable = False
+
+    index = pd.DatetimeIndex(dates.view('datetime64[ns]'))
+    panel = PricePanel(index, descriptor.tickers, prices, volumes, returns=returns)
+    return panel, shm
@@ -0,0 +1,86 @@
+"""
+Signal engine working on raw NumPy price arrays.
+
+Each function takes a 1-D float64 price array and returns a compact int8
+signal array (1 = long, -1 = short, 0 = flat) aligned with it. Pass
+indicators=True to also get the intermediate indicator arrays, and pass an
+IndicatorCache built over the same prices to share indicators between
+strategies and parameter sets.
+"""
+import numpy as np
+
+from quant.indicators import IndicatorCache
+
+
+def _cache(price, cache):
+    return cache if cache is not None else IndicatorCache(price=price)
+
+
+def crossover(fast, slow):
+    """1 where fast > slow, -1 where fast < slow, 0 on ties and during warm-up"""
+    return (fast > slow).view(np.int8) - (fast < slow).view(np.int8)
+
+
+def band_signal(values, lower, upper):
+    """1 below the lower band, -1 above the upper band (lower wins if both), else 0"""
+    signal = np.negative(values > upper, dtype=np.int8)
+    signal[values < lower] = 1
+    return signal
+
+
+def moving_average_signal(price, short_window=20, long_window=50, indicators=False, cache=None):
+    cache = _cache(price, cache)
+    ma_short = cache.get('sma', short_window)
+    ma_long = cache.get('sma', long_window)
+
+    signal = crossover(ma_short, ma_long)
+    if indicators:
+        return signal, {'MA_short': ma_short, 'MA_long': ma_long}
+    return signal
+
+
+def rsi_signal(price, window=14, overbought=70, oversold=30, indicators=False, cache=None):
+    rsi = _cache(price, cache).get('rsi', window)
+
+    signal = band_signal(rsi, oversold, overbought)
+    if indicators:
+        return signal, {'RSI': rsi}
+    return signal
+
+
+def macd_signal(price, fast=12, slow=26, signal_window=9, indicators=False, cache=None):
+    cache = _cache(price, cache)
+    macd = cache.get('macd', fast, slow)
+    macd_line_signal = cache.get('macd_signal', fast, slow, signal_window)
+
+    signal = crossover(macd, macd_line_signal)
+    if indicators:
+        return signal, {
+            'EMA_fast': cache.get('ema', fast),
+            'EMA_slow': cache.get('ema', slow),
+            'MACD': macd,
+            'MACD_signal': macd_line_signal,
+        }
+    return signal
+
+
+def bollinger_signal(price, window=20, num_std=2, indicators=False, cache=None):
+    cache = _cache(price, cache)
+    ma = cache.get('sma', window)
+    std = cache.get('std', window)
+    upper = ma + (std * num_std)
+    lower = ma - (std * num_std)
+
+    signal = band_signal(cache.source('price'), lower, upper)
+    if indicators:
+        return signal, {'MA': ma, 'STD': std, 'Upper_Band': upper, 'Lower_Band': lower}
+    return signal
+
+
+# Strategy name (as stored in backtest_results) -> signal function
+STRATEGIES = {
+    'Moving Average': moving_average_signal,
+    'RSI': rsi_signal,
+    'MACD': macd_signal,
+    'Bollinger Bands': bollinger_signal,
+}
@@ -0,0 +1,236 @@
+import json
+import os
+import tempfile
+import threading
+
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, Holiday, GoodFriday, USMartinLutherKingJr, USPresidentsDay, USMemorialDay,
+    USLaborDay, USThanksgivingDay, nearest_workday, sunday_to_monday
+)
+
+
+def to_timestamp(value):
+    """Normalize a date, datetime or 'YYYY-MM-DD' string to a midnight Timestamp"""
+    return pd.Timestamp(value).normalize()
+
+
+class ExchangeHolidayCalendar(AbstractHolidayCalendar):
+    """Full-day NYSE holidays (unscheduled closures are not included)"""
+    rules = [
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date="2022-06-19", observance=nearest_workday),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas Day", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+exchange_calendar = ExchangeHolidayCalendar()
+
+
+def has_sessions(start, end):
+    """Whether [start, end) contains a weekday that is not an exchange holiday"""
+    holidays = exchange_calendar.holidays(start, end)
+    return len(pd.bdate_range(start, end, freq='C', holidays=holidays, inclusive='left')) > 0
+
+
+def missing_ranges(coverage, start, end):
+    """
+    Return the [start, end) ranges that must be fetched so the covered range
+    contains [start, end). Gaps are filled so the coverage stays contiguous.
+    """
+    if start >= end:
+        return []
+    if coverage is None:
+        return [(start, end)]
+
+    covered_start, covered_end = coverage
+    if end <= covered_start:
+        return [(start, covered_start)]
+    if start >= covered_end:
+        return [(covered_end, end)]
+
+    ranges = []
+    if start < covered_start:
+        ranges.append((start, covered_start))
+    if end > covered_end:
+        ranges.append((covered_end, end))
+    return ranges
+
+
+def merge_coverage(coverage, start, end):
+    """Extend a coverage range with [start, end), never past today"""
+    # Today's bar is still forming, so it is never marked as covered
+    end = min(end, pd.Timestamp.today().normalize())
+    if coverage is None:
+        return start, max(start, end)
+    return min(coverage[0], start), max(coverage[1], end)
+
+
+def empty_frame():
+    """Return an empty price frame with the store's column layout"""
+    return pd.DataFrame({'price': [], 'volume': []}, index=pd.DatetimeIndex([]))
+
+
+def merge_frames(old, new):
+    """Merge newly fetched rows into cached rows, preferring the new values"""
+    if old is None or old.empty:
+        merged = new
+    elif new is None or new.empty:
+        merged = old
+    else:
+        merged = pd.concat([old, new])
+        merged = merged[~merged.index.duplicated(keep='last')]
+    return merged.sort_index()
+
+
+def write_atomic(path, write):
+    """
+    Call write(tmp_path) on a uniquely named file next to path, then swap it
+    in, so readers never see a partial file and concurrent writers (threads
+    or processes) never share a temporary file
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class PriceStore:
+    """
+    Base class for persistent per-ticker price stores.
+
+    A store keeps raw 'price' and 'volume' columns indexed by date together
+    with the [start, end) range that has already been fetched, so repeat
+    requests only go to the provider for the dates it has not seen yet.
+    """
+
+    # Whether fetch_price_data should keep copies of this store's rows in memory
+    memory_cached = True
+
+    def __init__(self):
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, ticker):
+        # Keyed like the stored data, so 'aapl' and 'AAPL' serialize on one lock
+        with self._locks_guard:
+            return self._locks.setdefault(ticker.upper(), threading.Lock())
+
+    def coverage(self, ticker):
+        """Return the (start, end) range already stored for a ticker, or None"""
+        raise NotImplementedError
+
+    def read(self, ticker, start, end):
+        """Return stored rows in [start, end)"""
+        raise NotImplementedError
+
+    def write(self, ticker, df, coverage):
+        """Merge new rows into the store and record the new coverage"""
+        raise NotImplementedError
+
+    def _extend(self, ticker, coverage, pieces):
+        """Write fetched (start, end, df) pieces and extend the coverage over them"""
+        fetched = []
+        for start, end, df in pieces:
+            # Failed downloads come back empty; only gaps of weekends and holidays may legitimately do so
+            if df.empty and has_sessions(start, end):
+                continue
+            coverage = merge_coverage(coverage, start, end)
+            fetched.append(df)
+
+        if fetched:
+            self.write(ticker, pd.concat(fetched), coverage)
+
+    def read_through(self, ticker, start, end, fetch):
+        """Serve [start, end) from the store, fetching only the missing ranges"""
+        start, end = to_timestamp(start), to_timestamp(end)
+
+        with self._lock(ticker):
+            coverage = self.coverage(ticker)
+            pieces = [(s, e, fetch(ticker, s, e)) for s, e in missing_ranges(coverage, start, end)]
+            self._extend(ticker, coverage, pieces)
+
+        return self.read(ticker, start, end)
+
+    def read_through_many(self, tickers, start, end, fetch_many):
+        """
+        Batched read_through. Tickers missing the same date range are fetched
+        together with one fetch_many(tickers, start, end) call.
+        """
+        start, end = to_timestamp(start), to_timestamp(end)
+
+        coverages = {ticker: self.coverage(ticker) for ticker in tickers}
+        groups = {}
+        for ticker in tickers:
+            for missing in missing_ranges(coverages[ticker], start, end):
+                groups.setdefault(missing, []).append(ticker)
+
+        pieces = {ticker: [] for ticker in tickers}
+        for (s, e), group in groups.items():
+            frames = fetch_many(group, s, e)
+            for ticker in group:
+                pieces[ticker].append((s, e, frames.get(ticker, empty_frame())))
+
+        for ticker in tickers:
+            if pieces[ticker]:
+                with self._lock(ticker):
+                    self._extend(ticker, coverages[ticker], pieces[ticker])
+
+        return {ticker: self.read(ticker, start, end) for ticker in tickers}
+
+
+class ParquetPriceStore(PriceStore):
+    """Price store keeping one Parquet file per ticker in a local directory"""
+
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+
+    def _paths(self, ticker):
+        base = os.path.join(self.directory, ticker.upper())
+        return base + ".parquet", base + ".json"
+
+    def coverage(self, ticker):
+        data_path, meta_path = self._paths(ticker)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return pd.Timestamp(meta['start']), pd.Timestamp(meta['end'])
+
+    def _load(self, ticker):
+        data_path, _ = self._paths(ticker)
+        if not os.path.exists(data_path):
+            return None
+        return pd.read_parquet(data_path)
+
+    def read(self, ticker, start, end):
+        df = self._load(ticker)
+        if df is None:
+            return empty_frame()
+        return df[(df.index >= start) & (df.index < end)]
+
+    def write(self, ticker, df, coverage):
+        os.makedirs(self.directory, exist_ok=True)
+        data_path, meta_path = self._paths(ticker)
+
+        merged = merge_frames(self._load(ticker), df[['price', 'volume']])
+
+        def write_meta(path):
+            with open(path, "w") as f:
+                json.dump({'start': coverage[0].isoformat(), 'end': coverage[1].isoformat()}, f)
+
+        write_atomic(data_path, merged.to_parquet)
+        write_atomic(meta_path, write_meta)
@@ -0,0 +1,264 @@
+"""
+Incremental strategy state for live bars.
+
+Each strategy object takes one price per update() call and returns the
+updated signal (1, -1 or 0) in constant time, using ring buffers and running
+sums/EMAs instead of reprocessing the history. The running statistics follow
+the same update order as pandas' rolling and ewm kernels, so once warmed up
+the signals match the batch functions in quant.strategies bar for bar.
+"""
+import math
+from collections import deque
+
+NAN = float('nan')
+
+# Relative drop in the sum of squares that triggers a variance recompute, as in pandas
+_INV_COND_TOL = 2.220446049250313e-16 * 1e3
+
+
+class RollingMean:
+    """Mean of the last `window` values using Kahan-compensated running sums"""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.sum = 0.0
+        self._add_compensation = 0.0
+        self._remove_compensation = 0.0
+        self._negatives = 0
+        self._same_run = 0
+        self._last = None
+
+    def update(self, value):
+        if len(self.values) == self.window:
+            old = self.values[0]
+            y = -old - self._remove_compensation
+            t = self.sum + y
+            self._remove_compensation = t - self.sum - y
+            self.sum = t
+            if math.copysign(1.0, old) < 0:
+                self._negatives -= 1
+
+        self.values.append(value)
+        y = value - self._add_compensation
+        t = self.sum + y
+        self._add_compensation = t - self.sum - y
+        self.sum = t
+        if math.copysign(1.0, value) < 0:
+            self._negatives += 1
+        self._same_run = self._same_run + 1 if value == self._last else 1
+        self._last = value
+
+        return self.value
+
+    @property
+    def value(self):
+        n = len(self.values)
+        if n < self.window:
+            return NAN
+
+        mean = self.sum / n
+        # Snap away floating point artifacts like pandas does
+        if self._same_run >= n:
+            return self._last
+        if self._negatives == 0 and mean < 0:
+            return 0.0
+        if self._negatives == n and mean > 0:
+            return 0.0
+        return mean
+
+
+class RollingVariance:
+    """Sample variance (ddof=1) of the last `window` values using Welford updates"""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self._reset()
+
+    def _reset(self):
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._add_compensation = 0.0
+        self._remove_compensation = 0.0
+        self._unstable = False
+
+    def _add(self, value):
+        prev_m2 = self._m2
+        self._n += 1
+        prev_mean = self._mean - self._add_compensation
+        y = value - self._add_compensation
+        t = y - self._mean
+        self._add_compensation = t + self._mean - y
+        self._mean = self._mean + t / self._n
+        self._m2 = self._m2 + (value - prev_mean) * (value - self._mean)
+        if prev_m2 * _INV_COND_TOL > self._m2:
+            self._unstable = True
+
+    def _remove(self, value):
+        prev_m2 = self._m2
+        self._n -= 1
+        if self._n == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+            self._unstable = False
+            return
+        prev_mean = self._mean - self._remove_compensation
+        y = value - self._remove_compensation
+        t = y - self._mean
+        self._remove_compensation = t + self._mean - y
+        self._mean = self._mean - t / self._n
+        self._m2 = self._m2 - (value - prev_mean) * (value - self._mean)
+        if prev_m2 * _INV_COND_TOL > self._m2:
+            self._unstable = True
+
+    def update(self, value):
+        if len(self.values) == self.window:
+            self._remove(self.values[0])
+        self.values.append(value)
+        self._add(value)
+
+        if self._unstable:
+            # Catastrophic cancellation: rebuild from the buffered window
+            self._reset()
+            for v in self.values:
+                self._add(v)
+            self._unstable = False
+
+        return self.value
+
+    @property
+    def value(self):
+        if len(self.values) < self.window or self._n <= 1:
+            return NAN
+        return self._m2 / (self._n - 1)
+
+
+class ExponentialMean:
+    """Exponential moving average matching pandas ewm(span=span, adjust=False).mean()"""
+
+    def __init__(self, span):
+        com = (span - 1) / 2.0
+        self._com = com
+        self._alpha = 1.0 / (1.0 + com)
+        self._old_wt_factor = 1.0 - self._alpha
+        self.value = NAN
+
+    def update(self, value):
+        if self.value != self.value:
+            self.value = value
+            return self.value
+
+        old_wt = self._old_wt_factor
+        new_wt = 1.0 - old_wt if self._com == 1 else self._alpha
+        if self.value != value:
+            self.value = (old_wt * self.value + new_wt * value) / (old_wt + new_wt)
+        return self.value
+
+
+def _crossover(fast, slow):
+    if fast > slow:
+        return 1
+    if fast < slow:
+        return -1
+    return 0
+
+
+def _band(value, lower, upper):
+    if value < lower:
+        return 1
+    if value > upper:
+        return -1
+    return 0
+
+
+class StreamingMovingAverage:
+    """Streaming moving_average_strategy"""
+
+    def __init__(self, short_window=20, long_window=50):
+        self.ma_short = RollingMean(short_window)
+        self.ma_long = RollingMean(long_window)
+        self.signal = 0
+
+    def update(self, price):
+        self.signal = _crossover(self.ma_short.update(price), self.ma_long.update(price))
+        return self.signal
+
+
+class StreamingRSI:
+    """Streaming rsi_strategy"""
+
+    def __init__(self, window=14, overbought=70, oversold=30):
+        self.overbought = overbought
+        self.oversold = oversold
+        self.avg_gain = RollingMean(window)
+        self.avg_loss = RollingMean(window)
+        self.rsi = NAN
+        self.signal = 0
+        self._last_price = None
+
+    def update(self, price):
+        # The first bar has no change; like the batch version it counts as a zero move
+        delta = 0.0 if self._last_price is None else price - self._last_price
+        self._last_price = price
+
+        gain = self.avg_gain.update(delta if delta > 0 else 0.0)
+        loss = self.avg_loss.update(-delta if delta < 0 else 0.0)
+
+        if gain != gain or loss != loss or (gain == 0 and loss == 0):
+            self.rsi = NAN
+        elif loss == 0:
+            self.rsi = 100.0
+        else:
+            self.rsi = 100 - (100 / (1 + gain / loss))
+
+        self.signal = _band(self.rsi, self.oversold, self.overbought)
+        return self.signal
+
+
+class StreamingMACD:
+    """Streaming macd_strategy"""
+
+    def __init__(self, fast=12, slow=26, signal_window=9):
+        self.ema_fast = ExponentialMean(fast)
+        self.ema_slow = ExponentialMean(slow)
+        self.macd_signal = ExponentialMean(signal_window)
+        self.macd = NAN
+        self.signal = 0
+
+    def update(self, price):
+        self.macd = self.ema_fast.update(price) - self.ema_slow.update(price)
+        self.signal = _crossover(self.macd, self.macd_signal.update(self.macd))
+        return self.signal
+
+
+class StreamingBollinger:
+    """Streaming bollinger_bands_strategy"""
+
+    def __init__(self, window=20, num_std=2):
+        self.num_std = num_std
+        self.ma = RollingMean(window)
+        self.var = RollingVariance(window)
+        self.upper = NAN
+        self.lower = NAN
+        self.signal = 0
+
+    def update(self, price):
+        ma = self.ma.update(price)
+        var = self.var.update(price)
+        std = math.sqrt(var) if var > 0 else (0.0 if var == var else NAN)
+
+        self.upper = ma + (std * self.num_std)
+        self.lower = ma - (std * self.num_std)
+        self.signal = _band(price, self.lower, self.upper)
+        return self.signal
+
+
+# Strategy name (as in quant.signals.STRATEGIES) -> streaming state class
+STREAMING_STRATEGIES = {
+    'Moving Average': StreamingMovingAverage,
+    'RSI': StreamingRSI,
+    'MACD': StreamingMACD,
+    'Bollinger Bands': StreamingBollinger,
+}
@@ -0,0 +1,156 @@
+"""
+Vectorized parameter sweeps.
+
+Every rolling window in a grid is computed at once from a single cumulative
+sum, and signals, backtests and metrics for all parameter combinations are
+evaluated as (bars x combinations) matrix operations in memory-bounded
+column chunks.
+
+Means from cumulative sums can differ from pandas' rolling kernels in the
+last few bits, so a combination can disagree with the single-run strategy on
+bars where the two averages tie exactly (e.g. flat prices).
+"""
+import numpy as np
+import pandas as pd
+
+from quant.backtest import backtest_matrix
+from quant.risk import performance_metrics
+
+# Upper bound on the number of float64 cells in one (bars x combinations) block
+MAX_BLOCK_CELLS = 4_000_000
+
+
+def _cumsum(values):
+    """Zero-prefixed cumulative sum, so window sums are csum[t + 1] - csum[t + 1 - w]"""
+    csum = np.empty(len(values) + 1)
+    csum[0] = 0.0
+    np.cumsum(values, out=csum[1:])
+    return csum
+
+
+def _window_sums(csum, windows):
+    """(bars x windows) trailing window sums taken from one cumulative sum; NaN in warm-up"""
+    sums = np.full((len(csum) - 1, len(windows)), np.nan)
+    for j, w in enumerate(windows):
+        sums[w - 1:, j] = csum[w:] - csum[:-w]
+    return sums
+
+
+def rolling_mean_matrix(values, windows):
+    """Rolling means of `values` for every window, shape (len(values), len(windows))"""
+    values = np.asarray(values, dtype=np.float64)
+    # Centering on the first value keeps the cumulative sum small and accurate
+    offset = values[0] if len(values) else 0.0
+    windows = np.asarray(windows)
+    return _window_sums(_cumsum(values - offset), windows) / windows + offset
+
+
+def rolling_std_matrix(values, windows):
+    """Rolling sample standard deviations (ddof=1) for every window"""
+    values = np.asarray(values, dtype=np.float64)
+    centered = values - (values[0] if len(values) else 0.0)
+    windows = np.asarray(windows)
+
+    sums = _window_sums(_cumsum(centered), windows)
+    squares = _window_sums(_cumsum(centered * centered), windows)
+    var = (squares - sums * sums / windows) / (windows - 1)
+    return np.sqrt(np.maximum(var, 0.0))
+
+
+def evaluate_signals(signals, returns, periods_per_year=252):
+    """
+    Backtest a (bars x combinations) signal matrix against one return vector.
+    Returns per-column Sharpe ratio, total return (%) and max drawdown,
+    matching quant.backtest.backtest and quant.risk for a single column.
+    """
+    metrics = performance_metrics(*backtest_matrix(returns, signals), alpha=None, periods_per_year=periods_per_year)
+    return metrics['sharpe'], metrics['total_return'], metrics['max_drawdown']
+
+
+def _column_chunks(n_bars, n_columns, max_cells=MAX_BLOCK_CELLS):
+    step = max(1, max_cells // max(n_bars, 1))
+    for start in range(0, n_columns, step):
+        yield slice(start, min(start + step, n_columns))
+
+
+def _ranked_table(params, sharpe, total_return, max_dd):
+    table = pd.DataFrame(params)
+    table['sharpe'] = sharpe
+    table['total_return'] = total_return
+    table['max_drawdown'] = max_dd
+    return table.sort_values('sharpe', ascending=False, na_position='last').reset_index(drop=True)
+
+
+def sweep_moving_average(price, returns, short_windows=range(5, 201), long_windows=range(5, 201),
+                         periods_per_year=252):
+    """
+    Evaluate the moving average crossover for every short < long window pair.
+
+    Returns (table, heatmap): a DataFrame ranked by Sharpe with columns
+    short_window, long_window, sharpe, total_return and max_drawdown, and a
+    (len(short_windows) x len(long_windows)) Sharpe array with NaN where
+    short >= long.
+    """
+    price = np.asarray(price, dtype=np.float64)
+    returns = np.asarray(returns, dtype=np.float64)
+    short_windows = np.asarray(list(short_windows))
+    long_windows = np.asarray(list(long_windows))
+
+    windows = np.union1d(short_windows, long_windows)
+    means = rolling_mean_matrix(price, windows)
+
+    si, li = np.nonzero(short_windows[:, None] < long_windows[None, :])
+    short_cols = np.searchsorted(windows, short_windows[si])
+    long_cols = np.searchsorted(windows, long_windows[li])
+
+    sharpe = np.empty(len(si))
+    total_return = np.empty(len(si))
+    max_dd = np.empty(len(si))
+    for cols in _column_chunks(len(price), len(si)):
+        fast, slow = means[:, short_cols[cols]], means[:, long_cols[cols]]
+        signals = (fast > slow).view(np.int8) - (fast < slow).view(np.int8)
+        sharpe[cols], total_return[cols], max_dd[cols] = evaluate_signals(signals, returns, periods_per_year)
+
+    heatmap = np.full((len(short_windows), len(long_windows)), np.nan)
+    heatmap[si, li] = sharpe
+
+    table = _ranked_table(
+        {'short_window': short_windows[si], 'long_window': long_windows[li]},
+        sharpe, total_return, max_dd
+    )
+    return table, heatmap
+
+
+def sweep_bollinger(price, returns, windows=range(5, 101), num_stds=(1.0, 1.5, 2.0, 2.5, 3.0),
+                    periods_per_year=252):
+    """
+    Evaluate the Bollinger Bands strategy for every (window, num_std) pair.
+
+    Returns (table, heatmap) like sweep_moving_average, with the heatmap
+    shaped (len(windows) x len(num_stds)).
+    """
+    price = np.asarray(price, dtype=np.float64)
+    returns = np.asarray(returns, dtype=np.float64)
+    windows = np.asarray(list(windows))
+    num_stds = np.asarray(list(num_stds), dtype=np.float64)
+
+    means = rolling_mean_matrix(price, windows)
+    stds = rolling_std_matrix(price, windows)
+
+    wi, ki = np.meshgrid(np.arange(len(windows)), np.arange(len(num_stds)), indexing='ij')
+    wi, ki = wi.ravel(), ki.ravel()
+
+    sharpe = np.empty(len(wi))
+    total_return = np.empty(len(wi))
+    max_dd = np.empty(len(wi))
+    for cols in _column_chunks(len(price), len(wi)):
+        ma, band = means[:, wi[cols]], stds[:, wi[cols]] * num_stds[ki[cols]]
+        upper, lower = ma + band, ma - band
+        signals = np.negative(price[:, None] > upper, dtype=np.int8)
+        signals[price[:, None] < lower] = 1
+        sharpe[cols], total_return[cols], max_dd[cols] = evaluate_signals(signals, returns, periods_per_year)
+
+    heatmap = sharpe.reshape(len(windows), len(num_stds))
+
+    table = _ranked_table({'window': windows[wi], 'num_std': num_stds[ki]}, sharpe, total_return, max_dd)
+    return table, heatmap
@@ -0,0 +1,161 @@
+"""
+Walk-forward optimization.
+
+The history is split into rolling folds of `train_size` in-sample bars
+followed by `test_size` out-of-sample bars. In each fold every parameter set
+of a strategy is backtested on the in-sample bars, the best one by the
+objective is traded on the out-of-sample bars, and the out-of-sample
+returns of all folds are stitched into one equity curve.
+
+Indicators and signals for the whole parameter grid are computed once over
+the full history through a shared IndicatorCache and sliced per fold, and
+each fold evaluates its grid as one (bars x parameter sets) backtest_matrix
+call. Folds run in a thread pool; the NumPy kernels release the GIL.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from quant.backtest import backtest_matrix
+from quant.config import BACKTEST_WORKERS
+from quant.indicators import IndicatorCache
+from quant.risk import performance_metrics
+from quant.signals import STRATEGIES
+
+# Default parameter grids, keyword arguments of the signal functions in quant.signals
+PARAM_GRIDS = {
+    'Moving Average': {'short_window': range(5, 55, 5), 'long_window': range(20, 210, 10)},
+    'RSI': {'window': (7, 10, 14, 21, 28), 'overbought': (65, 70, 75, 80), 'oversold': (20, 25, 30, 35)},
+    'MACD': {'fast': (5, 8, 12, 16), 'slow': (21, 26, 34, 42), 'signal_window': (5, 9, 13)},
+    'Bollinger Bands': {'window': range(10, 55, 5), 'num_std': (1.5, 2.0, 2.5, 3.0)},
+}
+
+# performance_metrics keys a fold can be optimized for; the tail metrics need alpha
+OBJECTIVES = ('sharpe', 'max_drawdown', 'final_equity', 'total_return', 'win_rate', 'num_trades',
+              'var', 'expected_shortfall')
+TAIL_OBJECTIVES = ('var', 'expected_shortfall')
+
+
+def _valid(params):
+    """Drop combinations where the fast leg is not faster than the slow one"""
+    if params.get('short_window', 0) >= params.get('long_window', np.inf):
+        return False
+    if params.get('fast', 0) >= params.get('slow', np.inf):
+        return False
+    return True
+
+
+def parameter_sets(param_grid):
+    """Every valid combination of a {param: values} grid as a list of dicts"""
+    names = list(param_grid)
+    combos = (dict(zip(names, values)) for values in product(*(param_grid[name] for name in names)))
+    return [params for params in combos if _valid(params)]
+
+
+def signal_matrix(price, strategy, param_sets, cache=None):
+    """(bars x parameter sets) int8 signals over the full history, sharing indicators"""
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    price = np.asarray(price, dtype=np.float64)
+    cache = cache if cache is not None else IndicatorCache(price=price)
+
+    signals = np.empty((len(price), len(param_sets)), dtype=np.int8)
+    for k, params in enumerate(param_sets):
+        signals[:, k] = STRATEGIES[strategy](price, cache=cache, **params)
+    return signals
+
+
+def fold_bounds(n_bars, train_size, test_size):
+    """(train_start, test_start, test_end) row positions of each fold"""
+    if train_size < 2 or test_size < 1:
+        raise ValueError("train_size must be at least 2 and test_size at least 1")
+    return [
+        (test_start - train_size, test_start, min(test_start + test_size, n_bars))
+        for test_start in range(train_size, n_bars, test_size)
+    ]
+
+
+def _best(scores, objective):
+    if objective == 'max_drawdown':
+        scores = -scores
+    if np.isnan(scores).all():
+        return 0
+    return int(np.nanargmax(scores))
+
+
+def walk_forward(df, strategy='Moving Average', param_grid=None, train_size=504, test_size=126,
+                 objective='sharpe', alpha=0.05, max_workers=None, periods_per_year=252):
+    """
+    Walk-forward analysis of one strategy over a fetch_price_data frame.
+
+    objective is one of OBJECTIVES (performance_metrics keys); max_drawdown
+    is minimized, every other metric maximized. alpha is the tail
+    probability of var and expected_shortfall. Returns a dict with:
+      folds: one dict per fold with its date range, chosen params, the
+             in-sample objective and out-of-sample metrics
+      returns / equity_curve: the stitched out-of-sample strategy returns
+             and equity as Series on the out-of-sample dates
+      metrics: performance_metrics of the stitched out-of-sample returns
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective}; expected one of {', '.join(OBJECTIVES)}")
+    param_sets = parameter_sets(param_grid if param_grid is not None else PARAM_GRIDS[strategy])
+    if not param_sets:
+        raise ValueError("The parameter grid has no valid combinations")
+
+    price = df['price'].to_numpy(dtype=np.float64)
+    returns = df['returns'].to_numpy(dtype=np.float64)
+    signals = signal_matrix(price, strategy, param_sets)
+
+    bounds = fold_bounds(len(df), train_size, test_size)
+    if not bounds:
+        raise ValueError(f"Need more than {train_size} bars for a walk-forward fold")
+
+    # VaR/ES cost a partition per parameter set, so in-sample they are only computed when optimized for
+    in_sample_alpha = alpha if objective in TAIL_OBJECTIVES else None
+
+    def run_fold(bound):
+        train_start, test_start, test_end = bound
+
+        equity, strat_returns = backtest_matrix(returns[train_start:test_start], signals[train_start:test_start])
+        in_sample = performance_metrics(equity, strat_returns, alpha=in_sample_alpha,
+                                        periods_per_year=periods_per_year)
+        k = _best(in_sample[objective], objective)
+
+        # Start one bar early so the position held into the first test bar earns its return
+        _, oos = backtest_matrix(returns[test_start - 1:test_end], signals[test_start - 1:test_end, k])
+        return k, in_sample[objective][k], oos[1:, 0]
+
+    workers = max_workers or BACKTEST_WORKERS or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=min(workers, len(bounds))) as pool:
+        fold_results = list(pool.map(run_fold, bounds))
+
+    index = df.index
+    oos_returns = np.concatenate([oos for _, _, oos in fold_results])
+    oos_index = index[bounds[0][1]:bounds[-1][2]]
+
+    folds = []
+    for (train_start, test_start, test_end), (k, score, oos) in zip(bounds, fold_results):
+        oos_metrics = performance_metrics(np.cumprod(1 + oos), oos, alpha=alpha, periods_per_year=periods_per_year)
+        folds.append({
+            'train_start': index[train_start],
+            'train_end': index[test_start - 1],
+            'test_start': index[test_start],
+            'test_end': index[test_end - 1],
+            'params': param_sets[k],
+            'in_sample_' + objective: score,
+            'out_of_sample': oos_metrics,
+        })
+
+    equity = np.cumprod(1 + oos_returns)
+    return {
+        'strategy': strategy,
+        'objective': objective,
+        'folds': folds,
+        'returns': pd.Series(oos_returns, index=oos_index),
+        'equity_curve': pd.Series(equity, index=oos_index),
+        'metrics': performance_metrics(equity, oos_returns, alpha=alpha, periods_per_year=periods_per_year),
+    }
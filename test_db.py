@@ -1,7 +1,7 @@
 from db.session import engine, SessionLocal
 from db.models import Base, BacktestResult
-from quant.backtest import run_all_backtests
-from quant.risk import compute_metrics
+from quant.data import fetch_price_panel
+from quant.parallel import run_backtests, expand_tasks
 from datetime import datetime, timedelta
 
 def test_connection():
@@ -38,33 +38,31 @@ def insert_sample_data():
         print(f"Running backtests from {start_date} to {end_date}")
         print("Running real backtests and inserting data...")
 
-        for ticker in tickers:
-            print(f"Processing {ticker}...")
-            backtest_results = run_all_backtests(ticker, start_date, end_date)
-
-            for strategy_name, model in backtest_results.items():
-                equity = model['equity_curve']
-                returns = model['returns']
-
-                final_equity, total_return, win_rate, num_trades = compute_metrics(
-                    equity, returns
-                )
-
-                result = BacktestResult(
-                    ticker=ticker,
-                    start_date=start_date,
-                    end_date=end_date,
-                    strategy_name=strategy_name,
-                    sharpe_ratio=round(model['sharpe'], 3),
-                    final_equity=round(final_equity, 4),
-                    max_drawdown=round(model['max_drawdown'], 4)*100,# Store as percentage
-                    total_return=round(total_return, 2),
-                    win_rate=round(win_rate, 2),
-                    num_trades=int(num_trades),
-                    created_at=datetime.now()
-                )
-
-                db.add(result)
+        # Download every ticker in one batched request and share it with the backtest workers
+        panel = fetch_price_panel(tickers, start_date, end_date)
+
+        results = run_backtests(expand_tasks(tickers), start_date, end_date, panel=panel)
+
+        for r in results:
+            if r['error']:
+                print(f"✗ {r['ticker']} {r['strategy']}: {r['error']}")
+                continue
+
+            result = BacktestResult(
+                ticker=r['ticker'],
+                start_date=start_date,
+                end_date=end_date,
+                strategy_name=r['strategy'],
+                sharpe_ratio=round(r['sharpe'], 3),
+                final_equity=round(r['final_equity'], 4),
+                max_drawdown=round(r['max_drawdown'], 4)*100,# Store as percentage
+                total_return=round(r['total_return'], 2),
+                win_rate=round(r['win_rate'], 2),
+                num_trades=int(r['num_trades']),
+                created_at=datetime.now()
+            )
+
+            db.add(result)
 
         db.commit()
         print("✓ Successfully inserted real backtest results!")